@@ -0,0 +1,113 @@
+import struct
+from collections import namedtuple
+from pathlib import Path
+from typing import Iterator, Tuple
+
+AudioInfo = namedtuple("AudioInfo", "codec duration sample_rate channels")
+
+# Bitrates in kbps, indexed [MPEG-1?][layer][index]
+_BITRATES = {
+    True: {1: [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+           2: [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+           3: [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320]},
+    False: {1: [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+            2: [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+            3: [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160]},
+}
+_SAMPLE_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}
+
+def mp3_header(b: bytes, i: int):
+    """Decode the frame header at i: (frame_length, samples, sample_rate, channels, mpeg1) or None."""
+    if i + 4 > len(b) or b[i] != 0xFF or (b[i+1] & 0xE0) != 0xE0:
+        return None
+    version = (b[i+1] >> 3) & 3
+    layer = 4 - ((b[i+1] >> 1) & 3)
+    br_idx, sr_idx = b[i+2] >> 4, (b[i+2] >> 2) & 3
+    if version == 1 or layer == 4 or br_idx in (0, 15) or sr_idx == 3:
+        return None
+    mpeg1 = version == 3
+    bitrate = _BITRATES[mpeg1][layer][br_idx] * 1000
+    sample_rate = _SAMPLE_RATES[version][sr_idx]
+    padding = (b[i+2] >> 1) & 1
+    channels = 1 if (b[i+3] >> 6) == 3 else 2
+    if layer == 1:
+        return (12 * bitrate // sample_rate + padding) * 4, 384, sample_rate, channels, mpeg1
+    samples = 1152 if (layer == 2 or mpeg1) else 576
+    return samples // 8 * bitrate // sample_rate + padding, samples, sample_rate, channels, mpeg1
+
+def _skip_id3(b: bytes) -> int:
+    if b[:3] != b"ID3" or len(b) < 10:
+        return 0
+    size = (b[6] << 21) | (b[7] << 14) | (b[8] << 7) | b[9]
+    return 10 + size + (10 if b[5] & 0x10 else 0)
+
+def side_info_size(mpeg1: bool, channels: int) -> int:
+    return (17 if channels == 1 else 32) if mpeg1 else (9 if channels == 1 else 17)
+
+def first_frame(b: bytes) -> int:
+    i = _skip_id3(b)
+    while i < len(b) and mp3_header(b, i) is None:
+        i += 1
+    if mp3_header(b, i) is None:
+        raise ValueError("no MPEG audio frame found")
+    return i
+
+def _info_frames(b: bytes, i: int):
+    """Frame count from a Xing/Info (LAME, ffmpeg) or VBRI (Fraunhofer) header frame at i, else None."""
+    length, samples, sample_rate, channels, mpeg1 = mp3_header(b, i)
+    x = i + 4 + side_info_size(mpeg1, channels)
+    if b[x:x+4] in (b"Xing", b"Info"):
+        flags = struct.unpack(">I", b[x+4:x+8])[0]
+        return struct.unpack(">I", b[x+8:x+12])[0] if flags & 1 else -1
+    v = i + 4 + 32
+    if b[v:v+4] == b"VBRI":
+        return struct.unpack(">I", b[v+14:v+18])[0]
+    return None
+
+def mp3_frames(b: bytes) -> Iterator[Tuple[int, int, int]]:
+    """(offset, length, samples) of each audio frame; ID3 tags and Xing/VBRI info frames are skipped."""
+    i = first_frame(b)
+    if _info_frames(b, i) is not None:
+        i += mp3_header(b, i)[0]
+    while True:
+        h = mp3_header(b, i)
+        if h is None or i + h[0] > len(b):
+            return
+        yield i, h[0], h[1]
+        i += h[0]
+
+def _probe_mp3(b: bytes) -> AudioInfo:
+    i = first_frame(b)
+    length, samples, sample_rate, channels, mpeg1 = mp3_header(b, i)
+    frames = _info_frames(b, i)
+    if frames is not None and frames >= 0:
+        return AudioInfo("mp3", frames * samples / sample_rate, sample_rate, channels)
+    # No index: walk the frame headers (no decoding) and count samples.
+    total = sum(n for _, _, n in mp3_frames(b))
+    return AudioInfo("mp3", total / sample_rate, sample_rate, channels)
+
+def _probe_wav(b: bytes) -> AudioInfo:
+    i, fmt = 12, None
+    while i + 8 <= len(b):
+        cid, size = b[i:i+4], struct.unpack("<I", b[i+4:i+8])[0]
+        if cid == b"fmt ":
+            codec, channels, sample_rate, _, block_align = struct.unpack("<HHIIH", b[i+8:i+22])
+            fmt = (channels, sample_rate, block_align)
+        elif cid == b"data" and fmt:
+            # Streamed WAVs (e.g. TTS APIs) leave the size as 0xFFFFFFFF: use what is on disk.
+            size = min(size, len(b) - i - 8)
+            channels, sample_rate, block_align = fmt
+            return AudioInfo("pcm_s16le" if block_align == 2 * channels else "pcm",
+                             size / block_align / sample_rate, sample_rate, channels)
+        i += 8 + size + (size & 1)
+    raise ValueError("WAV without fmt/data chunk")
+
+def probe_audio(path) -> AudioInfo:
+    """Codec, duration, rate and channels from MP3 frame headers or the WAV header; nothing is decoded."""
+    b = Path(path).read_bytes()
+    if b[:4] == b"RIFF" and b[8:12] == b"WAVE":
+        return _probe_wav(b)
+    return _probe_mp3(b)
+
+def audio_duration(path) -> float:
+    return probe_audio(path).duration
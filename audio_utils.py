@@ -0,0 +1,156 @@
+import struct, subprocess
+import numpy as np
+from pathlib import Path
+from typing import List, Tuple
+from audio_probe import probe_audio, mp3_frames, side_info_size, mp3_header, first_frame
+
+CHUNK = 64 * 1024
+
+def ffmpeg_exe() -> str:
+    # moviepy ships a static ffmpeg through imageio-ffmpeg; pydub expects one on PATH.
+    try:
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except Exception:
+        return "ffmpeg"
+
+def _silent_frame(header: bytes) -> bytes:
+    """An MPEG audio frame with zeroed side info and main data decodes to silence."""
+    h = bytearray(header[:4])
+    h[1] |= 0x01          # no CRC
+    h[2] &= 0xFD          # no padding: every silent frame has the same length
+    length = mp3_header(bytes(h), 0)[0]
+    return bytes(h) + bytes(length - 4)
+
+def _info_frame(header: bytes, frames: int) -> bytes:
+    """LAME-style 'Info' frame so decoders know the exact frame count of the joined file.
+    At low bitrates a frame is too short for the tag (8 kbps at 24 kHz is 24 bytes), so the Info
+    frame alone is written at the lowest bitrate that fits, as LAME does."""
+    h = bytearray(header[:4])
+    _, _, _, channels, mpeg1 = mp3_header(bytes(h), 0)
+    x = 4 + side_info_size(mpeg1, channels)
+    while mp3_header(_silent_frame(bytes(h)), 0)[0] < x + 12:
+        if h[2] >> 4 >= 14:
+            raise ValueError("no bitrate leaves room for the Info tag")
+        h[2] += 0x10
+    f = bytearray(_silent_frame(bytes(h)))
+    f[x:x+12] = b"Info" + struct.pack(">II", 1, frames)
+    return bytes(f)
+
+def concat_mp3_frames(files: List[str], outfile: str, lead_in: float, gap: float) -> Tuple[float, List[float]]:
+    """Join MP3 files by copying their frames, with silent frames for the lead-in and gaps; returns the
+    total length and where each file starts. No decode or re-encode; memory is one input file at a time.
+    Silence is whole frames, rounded against the ideal timeline so drift never exceeds half a frame.
+    Raises ValueError unless all inputs share rate and channels."""
+    infos = [probe_audio(f) for f in files]
+    if not infos or any(i.codec != "mp3" or (i.sample_rate, i.channels) != (infos[0].sample_rate, infos[0].channels)
+                        for i in infos):
+        raise ValueError("inputs are not MP3 with a common sample rate/channel layout")
+    first = Path(files[0]).read_bytes()
+    start = first_frame(first)
+    header = first[start:start+4]
+    samples = mp3_header(header, 0)[1]
+    frame_seconds = samples / infos[0].sample_rate
+    silence = _silent_frame(header)
+
+    # Plan silence so each segment starts where lead_in + sum(duration + gap) puts it.
+    plan, starts, ideal, actual = [], [], 0.0, 0.0
+    for info in infos:
+        ideal += lead_in if not plan else gap
+        n = max(0, round((ideal - actual) / frame_seconds))
+        actual += n * frame_seconds
+        plan.append(n)
+        starts.append(actual)
+        ideal += info.duration
+        actual += info.duration
+    ideal += gap
+    tail = max(0, round((ideal - actual) / frame_seconds))
+    total_frames = sum(plan) + tail + sum(round(i.duration / frame_seconds) for i in infos)
+
+    with open(outfile, "wb") as out:
+        out.write(_info_frame(header, total_frames))
+        for f, n in zip(files, plan):
+            out.write(silence * n)
+            b = Path(f).read_bytes()
+            for offset, length, _ in mp3_frames(b):
+                out.write(b[offset:offset+length])
+        out.write(silence * tail)
+    return total_frames * frame_seconds, starts
+
+def concat_via_pcm(files: List[str], outfile: str, lead_in: float, gap: float,
+                   sample_rate: int=24000, channels: int=1) -> Tuple[float, List[float]]:
+    """Streaming fallback for mixed inputs: each file is decoded by ffmpeg straight into one encoder's stdin.
+    Returns the total length and where each file starts."""
+    ffmpeg = ffmpeg_exe()
+    bytes_per_second = sample_rate * channels * 2
+    silence = lambda seconds: bytes(int(round(seconds * sample_rate)) * channels * 2)
+    written, starts = 0, []
+    encoder = subprocess.Popen([ffmpeg, "-hide_banner", "-loglevel", "error", "-y",
+                                "-f", "s16le", "-ar", str(sample_rate), "-ac", str(channels), "-i", "pipe:0",
+                                "-c:a", "libmp3lame", "-b:a", "128k", str(outfile)], stdin=subprocess.PIPE)
+    try:
+        encoder.stdin.write(silence(lead_in))
+        written += len(silence(lead_in))
+        for f in files:
+            starts.append(written / bytes_per_second)
+            decoder = subprocess.Popen([ffmpeg, "-hide_banner", "-loglevel", "error", "-i", str(f),
+                                        "-f", "s16le", "-ar", str(sample_rate), "-ac", str(channels), "pipe:1"],
+                                       stdout=subprocess.PIPE)
+            while True:
+                chunk = decoder.stdout.read(CHUNK)
+                if not chunk:
+                    break
+                encoder.stdin.write(chunk)
+                written += len(chunk)
+            if decoder.wait() != 0:
+                raise RuntimeError(f"ffmpeg could not decode {f}")
+            encoder.stdin.write(silence(gap))
+            written += len(silence(gap))
+    finally:
+        encoder.stdin.close()
+    if encoder.wait() != 0:
+        raise RuntimeError(f"ffmpeg could not encode {outfile}")
+    return written / bytes_per_second, starts
+
+def assemble_pcm(parts: List[dict], lead_in: float, gap: float) -> np.ndarray:
+    """Narration as one int16 array: lead-in, then each part's 'pcm' followed by a gap. Single preallocation.
+    Each part gets 'start', its offset in the narration in seconds."""
+    sample_rate = parts[0]["sample_rate"]
+    lead, pause = int(round(lead_in * sample_rate)), int(round(gap * sample_rate))
+    out = np.zeros(lead + sum(len(p["pcm"]) + pause for p in parts), dtype=np.int16)
+    pos = lead
+    for p in parts:
+        p["start"] = pos / sample_rate
+        out[pos:pos + len(p["pcm"])] = p["pcm"]
+        pos += len(p["pcm"]) + pause
+    return out
+
+def trim_silence(pcm: np.ndarray, sample_rate: int, threshold_db: float=-45.0,
+                 window_ms: float=10.0, pad_ms: float=40.0) -> Tuple[int, int]:
+    """Sample range [start, end) left after cutting leading/trailing silence, judged by RMS over
+    fixed windows (one vectorised pass). `pad_ms` of the quiet edge is kept so consonants survive.
+    All-silent input is returned whole."""
+    win = max(1, int(sample_rate * window_ms / 1000))
+    n = len(pcm) // win
+    if n == 0:
+        return 0, len(pcm)
+    frames = pcm[:n * win].astype(np.float32).reshape(n, win) / 32768.0
+    rms = np.sqrt(np.mean(frames * frames, axis=1))
+    loud = np.flatnonzero(rms > 10 ** (threshold_db / 20))
+    if loud.size == 0:
+        return 0, len(pcm)
+    pad = int(sample_rate * pad_ms / 1000)
+    return max(0, loud[0] * win - pad), min(len(pcm), (loud[-1] + 1) * win + pad)
+
+def pcm_to_mp3(samples: np.ndarray, sample_rate: int, bitrate: str="128k") -> bytes:
+    """Encode mono int16 samples to MP3 bytes in one ffmpeg call (no temp files)."""
+    proc = subprocess.run([ffmpeg_exe(), "-hide_banner", "-loglevel", "error",
+                           "-f", "s16le", "-ar", str(sample_rate), "-ac", "1", "-i", "pipe:0",
+                           "-c:a", "libmp3lame", "-b:a", bitrate, "-f", "mp3", "pipe:1"],
+                          input=samples.astype("<i2").tobytes(), stdout=subprocess.PIPE)
+    if proc.returncode != 0:
+        raise RuntimeError("ffmpeg could not encode MP3")
+    return proc.stdout
+
+def encode_pcm(samples: np.ndarray, sample_rate: int, outfile: str, bitrate: str="128k"):
+    Path(outfile).write_bytes(pcm_to_mp3(samples, sample_rate, bitrate))
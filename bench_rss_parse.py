@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+RSS 파싱 벤치마크: feedparser + BeautifulSoup + dateutil 경로 vs rss_fast 경로
+사용법: python bench_rss_parse.py [feed.xml] [반복 횟수]
+(파일이 없으면 Google News 형식의 100개 항목 피드를 합성해서 사용)
+"""
+
+import sys
+import time
+import feedparser
+from news_fetcher import _parse_entries
+from rss_fast import parse_google_news_rss
+
+def synthetic_feed(n: int=100) -> bytes:
+    items = []
+    for i in range(n):
+        items.append(
+            f"<item><title>경제 뉴스 {i}번 제목 &amp; 부제 - 연합뉴스</title>"
+            f"<link>https://news.google.com/rss/articles/CBMi{i:04d}?oc=5</link>"
+            f"<guid isPermaLink=\"false\">CBMi{i:04d}</guid>"
+            f"<pubDate>Wed, 27 Aug 2025 {i % 24:02d}:00:00 GMT</pubDate>"
+            f"<description>&lt;a href=\"https://news.google.com/rss/articles/CBMi{i:04d}?oc=5\" target=\"_blank\"&gt;"
+            f"경제 뉴스 {i}번 제목 &amp;amp; 부제&lt;/a&gt;&amp;nbsp;&amp;nbsp;&lt;font color=\"#6f6f6f\"&gt;연합뉴스&lt;/font&gt;"
+            f"</description><source url=\"https://www.yna.co.kr\">연합뉴스</source></item>"
+        )
+    doc = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+           '<rss version="2.0" xmlns:media="http://search.yahoo.com/mrss/"><channel>'
+           '<generator>NFE/5.0</generator><title>"경제" - Google 뉴스</title>'
+           '<link>https://news.google.com/search?q=%EA%B2%BD%EC%A0%9C&amp;hl=ko&amp;gl=KR&amp;ceid=KR:ko</link>'
+           + "".join(items) + "</channel></rss>")
+    return doc.encode("utf-8")
+
+def bench(label, fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        out = fn()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"   {label:<28} {elapsed * 1000:8.2f} ms/feed")
+    return out, elapsed
+
+def main():
+    content = open(sys.argv[1], "rb").read() if len(sys.argv) > 1 else synthetic_feed()
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    print("⏱️ RSS 파싱 벤치마크")
+    print("=" * 50)
+    for limit in (3, 100):
+        print(f"📰 항목 {limit}개 파싱")
+        slow, t_slow = bench("feedparser + BeautifulSoup", lambda: _parse_entries(feedparser.parse(content), limit), repeat)
+        fast, t_fast = bench("rss_fast", lambda: parse_google_news_rss(content, limit)[0], repeat)
+        print(f"   결과 일치: {'✅' if slow == fast else '❌'}   속도 향상: {t_slow / t_fast:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -14,6 +14,58 @@ CHANNEL_TITLE_PREFIX = os.getenv("CHANNEL_TITLE_PREFIX", "오늘의 뉴스 요
 CHANNEL_LOCALE = os.getenv("CHANNEL_LOCALE", "KR:ko")
 NEWS_TOPICS = [s.strip() for s in os.getenv("NEWS_TOPICS", "경제,IT,국내").split(",")]
 VIDEO_RESOLUTION = os.getenv("VIDEO_RESOLUTION", "1920x1080")
+VIDEO_ENGINE = os.getenv("VIDEO_ENGINE", "stills")  # "stills" (one frame per visual state) or "moviepy"
+NARRATION_CODEC = os.getenv("NARRATION_CODEC", "aac")  # "aac" or "opus"; encoded once per edition, copied into every video
+VIDEO_FONT = os.getenv("VIDEO_FONT", "")  # TTF/TTC for overlay text; Korean system fonts are tried otherwise
+
+# Encoder profiles (libx264). Content only changes at segment boundaries, so frames are tuned for
+# stills, a keyframe is forced at every visual change and keyint (seconds) only caps the GOP.
+ENCODER_PROFILE = os.getenv("ENCODER_PROFILE", "publish")  # draft | publish | archive
+ENCODER_THREADS = int(os.getenv("ENCODER_THREADS", "0"))  # 0 = x264 picks
+ENCODER_PROFILES = {
+    "draft": {"preset": "ultrafast", "crf": 30, "tune": "stillimage", "fps": 10, "keyint": 10.0, "threads": ENCODER_THREADS},
+    "publish": {"preset": "medium", "crf": 21, "tune": "stillimage", "fps": 30, "keyint": 5.0, "threads": ENCODER_THREADS},
+    "archive": {"preset": "slow", "crf": 18, "tune": "stillimage", "fps": 30, "keyint": 10.0, "threads": ENCODER_THREADS},
+}
+# Chunked encoding: stills are split into chunks encoded in worker processes, then joined losslessly
+ENCODER_CHUNK_WORKERS = int(os.getenv("ENCODER_CHUNK_WORKERS", "0"))  # 0 = one per CPU, 1 = no chunking
+ENCODER_CHUNK_RETRIES = int(os.getenv("ENCODER_CHUNK_RETRIES", "2"))  # per chunk
 BACKGROUND_IMAGE = os.getenv("BACKGROUND_IMAGE", "./background.jpg")
 
 OUTPUT_DIR = os.getenv("OUTPUT_DIR", "./data")
+CACHE_DIR = os.getenv("CACHE_DIR", os.path.join(OUTPUT_DIR, ".cache"))
+
+# News fetching
+FETCH_WORKERS = int(os.getenv("FETCH_WORKERS", "8"))
+FETCH_HOST_INTERVAL = float(os.getenv("FETCH_HOST_INTERVAL", "0.2"))  # seconds between requests to one host
+FETCH_TIMEOUT = float(os.getenv("FETCH_TIMEOUT", "15"))
+FEED_CACHE_DIR = os.getenv("FEED_CACHE_DIR", os.path.join(CACHE_DIR, "feeds"))  # empty disables
+SEEN_DB_PATH = os.getenv("SEEN_DB_PATH", os.path.join(CACHE_DIR, "seen.sqlite3"))  # empty disables
+SEEN_LOOKBACK_DAYS = float(os.getenv("SEEN_LOOKBACK_DAYS", "3"))
+NEAR_DUP_THRESHOLD = float(os.getenv("NEAR_DUP_THRESHOLD", "0.3"))  # shingle Jaccard; 0 disables
+
+# Pre-LLM ranking (0 disables: all fetched items are summarized)
+RANK_TOP_N = int(os.getenv("RANK_TOP_N", "0"))
+RANK_PER_TOPIC = int(os.getenv("RANK_PER_TOPIC", "5"))  # candidates fetched per topic before ranking
+RANK_HALF_LIFE_HOURS = float(os.getenv("RANK_HALF_LIFE_HOURS", "12"))
+
+# Summarization
+SUMMARY_BATCH_SIZE = int(os.getenv("SUMMARY_BATCH_SIZE", "1"))  # articles per request; 1 = one request per article
+SUMMARY_CONCURRENCY = int(os.getenv("SUMMARY_CONCURRENCY", "4"))  # in-flight requests; 1 = sequential
+SUMMARY_TIMEOUT = float(os.getenv("SUMMARY_TIMEOUT", "120"))  # seconds per request
+SUMMARY_MAX_RETRIES = int(os.getenv("SUMMARY_MAX_RETRIES", "4"))  # on 429/5xx/timeouts
+SUMMARY_CACHE_PATH = os.getenv("SUMMARY_CACHE_PATH", os.path.join(CACHE_DIR, "summaries.sqlite3"))  # empty disables
+SUMMARY_CACHE_MAX_ENTRIES = int(os.getenv("SUMMARY_CACHE_MAX_ENTRIES", "5000"))
+
+# TTS
+TTS_BACKEND = os.getenv("TTS_BACKEND", "openai")  # "offline": deterministic tones, no network (load tests)
+TTS_WORKERS = int(os.getenv("TTS_WORKERS", "4"))  # segments synthesized concurrently
+TTS_MAX_RETRIES = int(os.getenv("TTS_MAX_RETRIES", "3"))
+TTS_AUDIO_FORMAT = os.getenv("TTS_AUDIO_FORMAT", "mp3")  # "pcm": keep narration in memory, encode once at mux
+TTS_SENTENCE_CHUNKS = os.getenv("TTS_SENTENCE_CHUNKS", "false").lower() in ("1", "true", "yes")
+TTS_TRIM_SILENCE = os.getenv("TTS_TRIM_SILENCE", "true").lower() in ("1", "true", "yes")  # PCM segments only
+TTS_SILENCE_DB = float(os.getenv("TTS_SILENCE_DB", "-45"))  # RMS below this (dBFS) counts as silence
+TTS_LEAD_IN = float(os.getenv("TTS_LEAD_IN", "0.5"))  # seconds before the first segment
+TTS_SEGMENT_GAP = float(os.getenv("TTS_SEGMENT_GAP", "0.25"))  # seconds after each segment
+TTS_CACHE_DIR = os.getenv("TTS_CACHE_DIR", os.path.join(CACHE_DIR, "tts"))  # empty disables
+TTS_CACHE_MAX_BYTES = int(os.getenv("TTS_CACHE_MAX_BYTES", str(500 * 1024 * 1024)))
@@ -3,40 +3,16 @@
 최종 뉴스 브리핑 비디오 생성 - 배경과 텍스트 모두 확실히 표시
 """
 
-from moviepy.editor import ImageClip, CompositeVideoClip
-from PIL import Image, ImageDraw, ImageFont
-import numpy as np
-from pathlib import Path
+from PIL import ImageDraw, ImageFont
 import datetime
 import os
+from video_engine import encode_stills
+from frame_background import news_frame_base
 
 def create_final_news_frame(title, summary, frame_number, total_frames):
     """최종 뉴스 프레임 생성 - 배경과 텍스트 모두 확실히 표시"""
     W, H = 1920, 1080
     
-    # 1. 기본 배경 (밝은 파란색 그라데이션)
-    img = Image.new('RGB', (W, H), (30, 60, 120))
-    draw = ImageDraw.Draw(img)
-    
-    # 그라데이션 효과 (상단에서 하단으로)
-    for y in range(H):
-        # 파란색에서 어두운 파란색으로 그라데이션
-        blue_intensity = int(120 - (y / H) * 60)  # 120에서 60으로
-        color = (30, 60, blue_intensity)
-        draw.line([(0, y), (W, y)], fill=color)
-    
-    # 2. 상단 바 (뉴스 채널 스타일)
-    top_bar_color = (50, 100, 180)
-    draw.rectangle([0, 0, W, int(H*0.10)], fill=top_bar_color)
-    
-    # 3. 좌측 세로 바
-    left_bar_color = (80, 120, 200)
-    draw.rectangle([0, 0, int(W*0.02), H], fill=left_bar_color)
-    
-    # 4. 하단 바 (자막 영역)
-    bottom_bar_color = (20, 40, 80)
-    draw.rectangle([0, H-int(H*0.20), W, H], fill=bottom_bar_color)
-    
     # 5. 제목 (상단 중앙)
     try:
         # 폰트 설정
@@ -46,15 +22,22 @@ def create_final_news_frame(title, summary, frame_number, total_frames):
         ]
         
         title_font = None
+        title_font_path = None
         for font_path in font_paths:
             if os.path.exists(font_path):
                 title_font = ImageFont.truetype(font_path, 72)
+                title_font_path = font_path
                 break
         
         if title_font is None:
             title_font = ImageFont.load_default()
     except:
         title_font = ImageFont.load_default()
+        title_font_path = None
+    
+    # 1~4. 그라데이션 배경, 상단/좌측/하단 바, NEWS 아이콘 (모든 뉴스에 공통, 한 번만 생성해 재사용)
+    img = news_frame_base(W, H, palette="blue", style="news", badge_font=title_font_path)
+    draw = ImageDraw.Draw(img)
     
     # 제목 텍스트
     title_text = f"뉴스 브리핑 ({datetime.datetime.now().strftime('%Y-%m-%d')})"
@@ -103,12 +86,6 @@ def create_final_news_frame(title, summary, frame_number, total_frames):
         draw.text((100, y_position), line, fill=(255, 255, 0), font=summary_font)
         y_position += 40
     
-    # 8. 시각적 요소 추가 (뉴스 스타일)
-    # 우측 상단에 뉴스 아이콘 (간단한 사각형)
-    icon_color = (255, 255, 255)
-    draw.rectangle([W-150, 30, W-50, 80], fill=icon_color, outline=(200, 200, 200), width=3)
-    draw.text((W-140, 40), "NEWS", fill=(30, 60, 120), font=title_font)
-    
     return img
 
 def create_final_news_video():
@@ -142,23 +119,13 @@ def create_final_news_video():
         frame = create_final_news_frame(news['title'], news['summary'], i+1, len(news_data))
         frames.append(frame)
     
-    # 프레임을 비디오로 변환
-    clips = []
-    
-    for i, frame in enumerate(frames):
-        print(f"🎬 뉴스 {i+1} 비디오 클립 생성 중...")
-        # numpy 배열로 변환
-        frame_array = np.array(frame)
-        clip = ImageClip(frame_array).set_duration(duration_per_news)
-        clips.append(clip)
-    
-    # 모든 클립 합성
-    video = CompositeVideoClip(clips)
+    # 각 프레임을 한 번씩만 인코딩하고 ffmpeg가 재생 시간 동안 유지
+    stills = [(frame, duration_per_news) for frame in frames]
     
     # 출력
     output_path = "final_news_briefing.mp4"
     print(f"📹 비디오 저장 중: {output_path}")
-    video.write_videofile(output_path, fps=fps, codec="libx264", audio_codec="aac", preset="medium")
+    encode_stills(stills, output_path, fps=fps)
     
     print("✅ 최종 뉴스 브리핑 비디오 생성 완료!")
     print(f"📊 비디오 정보:")
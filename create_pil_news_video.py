@@ -3,12 +3,10 @@
 PIL을 직접 사용한 뉴스 브리핑 비디오 생성
 """
 
-from moviepy.editor import ImageClip, CompositeVideoClip
 from PIL import Image, ImageDraw, ImageFont
-import numpy as np
-from pathlib import Path
 import datetime
 import os
+from video_engine import encode_stills
 
 def create_text_image(text, size=(800, 200), bg_color=(60, 60, 60), text_color=(255, 255, 255), font_size=40):
     """PIL을 사용해서 텍스트 이미지 생성"""
@@ -107,22 +105,13 @@ def create_pil_news_video():
         frame = create_news_frame(news['title'], news['summary'], i+1, len(news_data))
         frames.append(frame)
     
-    # 프레임을 비디오로 변환
-    clips = []
-    
-    for i, frame in enumerate(frames):
-        # numpy 배열로 변환
-        frame_array = np.array(frame)
-        clip = ImageClip(frame_array).set_duration(duration_per_news)
-        clips.append(clip)
-    
-    # 모든 클립 합성
-    video = CompositeVideoClip(clips)
+    # 각 프레임을 한 번씩만 인코딩하고 ffmpeg가 재생 시간 동안 유지
+    stills = [(frame, duration_per_news) for frame in frames]
     
     # 출력
     output_path = "pil_news_briefing.mp4"
     print(f"📹 비디오 저장 중: {output_path}")
-    video.write_videofile(output_path, fps=fps, codec="libx264", audio_codec="aac", preset="medium")
+    encode_stills(stills, output_path, fps=fps)
     
     print("✅ PIL을 사용한 뉴스 브리핑 비디오 생성 완료!")
     print(f"📊 비디오 정보:")
@@ -0,0 +1,121 @@
+import re, random, unicodedata, zlib
+from typing import List, Dict, Optional, Set, Tuple
+
+# Korean particles and endings glued to the stem ("러시아에", "러시아와"); stripped so both shingle alike.
+_JOSA = re.compile(r'(으로|에서|에게|까지|부터|이다|했다|한다|은|는|이|가|을|를|에|의|와|과|도|로|만)$')
+_SOURCE_SUFFIX = re.compile(r'\s+-\s+[^-]+$')
+
+NUM_PERM = 64
+BANDS = 32  # 2 rows per band: pairs around Jaccard 0.25 still become candidates
+_PRIME = (1 << 61) - 1
+_rng = random.Random(8271)
+_PERMS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+def shingles(text: str) -> Set[str]:
+    """Character bigrams per normalised token (NFKC, lowercase, particles stripped)."""
+    text = unicodedata.normalize("NFKC", text).lower()
+    out = set()
+    for w in re.split(r'[\W_]+', text):
+        if len(w) > 2:
+            w = _JOSA.sub('', w)
+        if len(w) == 1:
+            out.add(w)
+        for i in range(len(w) - 1):
+            out.add(w[i:i+2])
+    return out
+
+def headline(item: Dict) -> str:
+    """Title without the Google News " - 매체명" suffix."""
+    return _SOURCE_SUFFIX.sub('', item.get("title") or "")
+
+def item_shingles(item: Dict) -> Set[str]:
+    title = headline(item)
+    summary = item.get("summary") or ""
+    if item.get("source"):
+        summary = summary.replace(item["source"], " ")
+    return shingles(f"{title} {summary}")
+
+def minhash(sh: Set[str]) -> Tuple[int, ...]:
+    hashes = [zlib.crc32(s.encode("utf-8")) for s in sh] or [0]
+    return tuple(min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMS)
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+class NearDupIndex:
+    """MinHash LSH index: banded buckets give candidates, exact shingle Jaccard confirms them."""
+    def __init__(self, threshold: float=0.3):
+        self.threshold = threshold
+        self._rows = NUM_PERM // BANDS
+        self._buckets = [dict() for _ in range(BANDS)]
+        self._shingles = []
+
+    def _bands(self, sig):
+        r = self._rows
+        return [sig[i*r:(i+1)*r] for i in range(BANDS)]
+
+    def query(self, sh: Set[str], sig=None) -> Optional[int]:
+        """Index of the most similar stored entry at or above the threshold, else None."""
+        sig = sig or minhash(sh)
+        candidates = set()
+        for band, key in zip(self._buckets, self._bands(sig)):
+            candidates.update(band.get(key, ()))
+        best, best_sim = None, self.threshold
+        for c in sorted(candidates):
+            sim = jaccard(sh, self._shingles[c])
+            if sim >= best_sim:
+                best, best_sim = c, sim
+        return best
+
+    def add(self, sh: Set[str], sig=None) -> int:
+        sig = sig or minhash(sh)
+        idx = len(self._shingles)
+        self._shingles.append(sh)
+        for band, key in zip(self._buckets, self._bands(sig)):
+            band.setdefault(key, []).append(idx)
+        return idx
+
+    def add_if_new(self, item: Dict) -> bool:
+        """Online dedup: store and return True unless a near-duplicate is already indexed."""
+        sh = item_shingles(item)
+        sig = minhash(sh)
+        if self.query(sh, sig) is not None:
+            return False
+        self.add(sh, sig)
+        return True
+
+def cluster_items(items: List[Dict], threshold: float=0.3) -> List[List[int]]:
+    """Group item indices into near-duplicate clusters, each cluster in input order."""
+    index = NearDupIndex(threshold)
+    parent = list(range(len(items)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, it in enumerate(items):
+        sh = item_shingles(it)
+        sig = minhash(sh)
+        match = index.query(sh, sig)
+        if match is not None:
+            parent[find(i)] = find(match)
+        index.add(sh, sig)
+    clusters = {}
+    for i in range(len(items)):
+        clusters.setdefault(find(i), []).append(i)
+    return sorted(clusters.values(), key=lambda c: c[0])
+
+def item_quality(item: Dict) -> Tuple:
+    return (item.get("published") is not None, bool(item.get("source")), min(len(item.get("summary") or ""), 400))
+
+def dedupe_items(items: List[Dict], threshold: float=0.3) -> List[Dict]:
+    """Keep the best representative of each near-duplicate cluster, at the cluster's first position."""
+    out = []
+    for cluster in cluster_items(items, threshold):
+        best = max(cluster, key=lambda i: (item_quality(items[i]), -i))
+        out.append(items[best])
+    return out
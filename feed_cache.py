@@ -0,0 +1,42 @@
+import os, json, hashlib, time
+from pathlib import Path
+from typing import List, Dict, Optional
+
+class FeedCache:
+    """On-disk conditional-GET cache for RSS feeds: validators plus already-parsed entries, one JSON file per URL."""
+    def __init__(self, cache_dir: str):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, url: str) -> Path:
+        return self.cache_dir / (hashlib.sha1(url.encode("utf-8")).hexdigest() + ".json")
+
+    def get(self, url: str) -> Optional[Dict]:
+        try:
+            with open(self._path(url), encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return data if data.get("url") == url else None
+
+    def validators(self, entry: Optional[Dict], limit: int) -> Dict[str, str]:
+        """Conditional request headers, only if the cached entries can serve `limit` items."""
+        if not entry or len(entry["entries"]) < min(limit, entry["total"]):
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def put(self, url: str, etag: Optional[str], last_modified: Optional[str], entries: List[Dict], total: int):
+        if not etag and not last_modified:
+            return
+        data = {"url": url, "etag": etag, "last_modified": last_modified,
+                "entries": entries, "total": total, "fetched_at": time.time()}
+        path = self._path(url)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp, path)
@@ -0,0 +1,49 @@
+from functools import lru_cache
+from typing import Optional
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+# Colours of the PIL news frames: vertical gradient (top -> bottom), bars and the "NEWS" badge
+PALETTES = {
+    "blue": {"top": (30, 60, 120), "bottom": (30, 60, 60), "top_bar": (50, 100, 180), "left_bar": (80, 120, 200),
+             "bottom_bar": (20, 40, 80), "badge": (255, 255, 255), "badge_outline": (200, 200, 200),
+             "badge_text": (30, 60, 120)},
+}
+STYLES = ("news", "plain")  # news = gradient + bars + badge, plain = gradient only
+
+def gradient(W: int, H: int, top: tuple, bottom: tuple) -> np.ndarray:
+    """Vertical gradient in one broadcast; row y is int(top + (y/H) * (bottom - top)) per channel,
+    the same truncation as the per-row draw.line loop it replaces."""
+    frac = (np.arange(H, dtype=np.float64) / H)[:, None]
+    rows = np.asarray(top, dtype=np.float64) + frac * (np.asarray(bottom, dtype=np.float64) - np.asarray(top))
+    return np.broadcast_to(rows.astype(np.uint8)[:, None, :], (H, W, 3)).copy()
+
+def _fill(frame: np.ndarray, x0: int, y0: int, x1: int, y1: int, color: tuple):
+    # Inclusive corners, as ImageDraw.rectangle
+    frame[max(y0, 0):y1 + 1, max(x0, 0):x1 + 1] = color
+
+@lru_cache(maxsize=16)
+def _base(W: int, H: int, palette: str, style: str, badge_font: Optional[str], badge_size: int) -> np.ndarray:
+    p = PALETTES[palette]
+    frame = gradient(W, H, p["top"], p["bottom"])
+    if style == "news":
+        _fill(frame, 0, 0, W, int(H*0.10), p["top_bar"])
+        _fill(frame, 0, 0, int(W*0.02), H, p["left_bar"])
+        _fill(frame, 0, H-int(H*0.20), W, H, p["bottom_bar"])
+        # Badge: 3px outline drawn inside the box, then the label
+        _fill(frame, W-150, 30, W-50, 80, p["badge_outline"])
+        _fill(frame, W-147, 33, W-53, 77, p["badge"])
+        img = Image.fromarray(frame)
+        font = ImageFont.truetype(badge_font, badge_size) if badge_font else ImageFont.load_default()
+        ImageDraw.Draw(img).text((W-140, 40), "NEWS", fill=p["badge_text"], font=font)
+        frame = np.asarray(img)
+    frame.flags.writeable = False
+    return frame
+
+def news_frame_base(W: int=1920, H: int=1080, palette: str="blue", style: str="news",
+                    badge_font: Optional[str]=None, badge_size: int=72) -> Image.Image:
+    """Background shared by every item of the PIL news frames, built once per
+    (W, H, palette, style, badge font) and returned as a fresh image to draw the item's text on."""
+    if palette not in PALETTES or style not in STYLES:
+        raise ValueError(f"unknown palette/style {palette!r}/{style!r}")
+    return Image.fromarray(_base(W, H, palette, style, badge_font, badge_size))
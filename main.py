@@ -1,12 +1,19 @@
-import os, datetime
+import os, datetime, asyncio
 from pathlib import Path
 from config import (NEWS_TOPICS, CHANNEL_LOCALE, CHANNEL_TITLE_PREFIX,
                     OUTPUT_DIR, BACKGROUND_IMAGE, VIDEO_RESOLUTION,
-                    YOUTUBE_CLIENT_SECRETS_FILE)
-from news_fetcher import fetch_news
-from summarizer_openai import summarize_items
+                    YOUTUBE_CLIENT_SECRETS_FILE, RANK_TOP_N, RANK_PER_TOPIC,
+                    SUMMARY_CONCURRENCY, TTS_AUDIO_FORMAT, TTS_LEAD_IN, TTS_SEGMENT_GAP,
+                    NARRATION_CODEC)
+from news_fetcher import fetch_news, iter_news, aiter_news
+from ranker import rank_items
+from seen_store import get_seen_store
+from summarizer_openai import summarize_items, asummarize_items
+from summary_cache import get_summary_cache
 from tts_openai import synthesize_segments, concat_audio
-from video_maker import make_video, build_srt
+from audio_utils import assemble_pcm
+from video_maker import render_outputs, build_srt
+from video_engine import encode_audio, edition_audio, AUDIO_CODECS
 from thumbnail_gen import generate_thumbnail
 from uploader_youtube import get_service, upload_video, get_or_create_playlist, add_video_to_playlist
 from utils import ensure_dir
@@ -15,10 +22,31 @@ def run_once():
     today = datetime.datetime.now().strftime("%Y-%m-%d")
     out_dir = Path(OUTPUT_DIR) / today
     ensure_dir(out_dir)
-    # 1) Fetch
-    items = fetch_news(NEWS_TOPICS, per_topic=2, ceid=CHANNEL_LOCALE)
+    # 1) Fetch (only stories not briefed in the lookback window)
+    seen = get_seen_store()
+    if RANK_TOP_N > 0:
+        # Over-fetch without dedup (cluster sizes feed the score), keep the top N
+        candidates = fetch_news(NEWS_TOPICS, per_topic=RANK_PER_TOPIC, ceid=CHANNEL_LOCALE, seen=seen, near_dup_threshold=0)
+        items = rank_items(candidates, RANK_TOP_N)
+    else:
+        # Streamed, so 2) Summarize starts on the first feed instead of waiting for the slowest one
+        stream = aiter_news if SUMMARY_CONCURRENCY > 1 else iter_news
+        items = stream(NEWS_TOPICS, per_topic=2, ceid=CHANNEL_LOCALE, seen=seen)
     # 2) Summarize
-    enriched = summarize_items(items)
+    if SUMMARY_CONCURRENCY > 1:
+        enriched = asyncio.run(asummarize_items(items))
+    else:
+        enriched = summarize_items(items)
+    # Checked after summarizing: the streamed path only knows it is empty once the stream is consumed
+    if not enriched:
+        print("📭 새로 브리핑할 뉴스가 없습니다. (이미 다룬 뉴스 제외) 이번 실행은 건너뜁니다.")
+        return
+    if RANK_TOP_N <= 0:
+        enriched.sort(key=lambda it: NEWS_TOPICS.index(it["topic"]))  # stable: topic order, then feed order
+    summary_cache = get_summary_cache()
+    if summary_cache:
+        st = summary_cache.stats()
+        print(f"💾 요약 캐시: 적중 {st['hits']}건 / 미스 {st['misses']}건 (API 호출 {st['hits']}건 절약)")
     # 3) Narration segments
     title = f"{CHANNEL_TITLE_PREFIX} ({today})"
     segments = [f"안녕하세요. {today} 주요 뉴스를 3분 안에 요약해 드립니다."]
@@ -30,25 +58,32 @@ def run_once():
     segments.append("시청해 주셔서 감사합니다. 내일 다시 뵙겠습니다.")
 
     # 4) TTS
-    parts = synthesize_segments(segments, out_dir / "audio")
-    concat_audio(parts, out_dir / "narration.mp3")
+    if TTS_AUDIO_FORMAT == "pcm":
+        # Narration stays in memory; the only compressed encode is the video mux
+        parts = synthesize_segments(segments, out_dir / "audio", fmt="pcm")
+        pcm = assemble_pcm(parts, TTS_LEAD_IN, TTS_SEGMENT_GAP)
+        narration = encode_audio((pcm, parts[0]["sample_rate"]),
+                                 out_dir / f"narration{AUDIO_CODECS[NARRATION_CODEC][1]}", NARRATION_CODEC)
+    else:
+        parts = synthesize_segments(segments, out_dir / "audio")
+        concat_audio(parts, out_dir / "narration.mp3", TTS_LEAD_IN, TTS_SEGMENT_GAP)
+        narration = edition_audio(out_dir / "narration.mp3", NARRATION_CODEC)
+    # One encoded narration per edition; every video below stream-copies it
 
-    # Build timeline
+    # Build timeline from where each part actually sits in the narration (after the lead-in, trimmed
+    # lengths, explicit gaps); each entry runs until the next part starts
+    bounds = [0.0] + [p["start"] for p in parts[1:]] + [parts[-1]["start"] + parts[-1]["duration"] + TTS_SEGMENT_GAP]
     timeline = []
-    t = 0.0
     for idx, p in enumerate(parts, start=1):
-        start = t
-        end = t + p["duration"] + 0.25
         headline = headlines[idx-2] if 1 < idx < len(parts) else "뉴스 브리핑"
-        timeline.append({"start": start, "end": end, "headline": headline})
-        t = end
+        timeline.append({"start": bounds[idx-1], "end": bounds[idx], "headline": headline})
 
     # 5) Captions
     srt_segs = []
-    t = 0.0
     for p in parts:
-        srt_segs.append({"start": t, "end": t + p["duration"], "text": p["text"]})
-        t += p["duration"] + 0.25
+        # Sentence-chunked TTS gives per-sentence timing for free; otherwise one cue per segment
+        for s in p.get("sentences") or [{"start": 0.0, "end": p["duration"], "text": p["text"]}]:
+            srt_segs.append({"start": p["start"] + s["start"], "end": p["start"] + s["end"], "text": s["text"]})
     build_srt(srt_segs, out_dir / "captions.srt")
 
     # 6) Thumbnails (auto)
@@ -56,14 +91,13 @@ def run_once():
     thumb_path = str(out_dir / "thumbnail.jpg")
     generate_thumbnail(thumb_path, today, keywords)
 
-    # 7) Videos: landscape and shorts
+    # 7) Videos: landscape and shorts (1080x1920) from one render pass
     landscape_path = str(out_dir / "news_briefing.mp4")
-    make_video(str(out_dir / "narration.mp3"), timeline, BACKGROUND_IMAGE, VIDEO_RESOLUTION, title, landscape_path, mode="landscape")
-
-    # shorts 1080x1920
-    shorts_res = "1080x1920"
     shorts_path = str(out_dir / "news_briefing_shorts.mp4")
-    make_video(str(out_dir / "narration.mp3"), timeline, BACKGROUND_IMAGE, shorts_res, title, shorts_path, mode="shorts")
+    render_outputs(narration, timeline, BACKGROUND_IMAGE, title, [
+        {"path": landscape_path, "resolution": VIDEO_RESOLUTION, "mode": "landscape"},
+        {"path": shorts_path, "resolution": "1080x1920", "mode": "shorts"},
+    ])
 
     # 8) YouTube: upload + playlists
     try:
@@ -82,6 +116,9 @@ def run_once():
         shorts_id = upload_video(youtube, shorts_path, f"{title} #shorts", description, tags=["뉴스","요약","브리핑","shorts"], privacy_status="unlisted", thumbnail_path=thumb_path)
 
         (out_dir / "video_ids.txt").write_text(f"landscape={video_id}\nshorts={shorts_id}\n", encoding="utf-8")
+        # Only published stories count as seen, so a failed upload retries the same stories
+        if seen:
+            seen.mark_seen(enriched)
     except Exception as e:
         print("YouTube 업로드/재생목록 처리 건너뜀/오류:", e)
 
@@ -1,41 +1,209 @@
-import feedparser, time
-from typing import List, Dict
-from urllib.parse import quote_plus
+import feedparser, time, threading, asyncio
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Tuple, Iterator, AsyncIterator, Callable
+from urllib.parse import quote_plus, urlparse
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
 from dateutil import parser as dateparser
-from utils import clean_google_news_link
+from config import FETCH_WORKERS, FETCH_HOST_INTERVAL, FETCH_TIMEOUT, FEED_CACHE_DIR, NEAR_DUP_THRESHOLD
+from dedup import dedupe_items, NearDupIndex
+from feed_cache import FeedCache
+from rss_fast import parse_google_news_rss
+from seen_store import SeenStore
+from utils import clean_google_news_link, canonical_link
 
 def google_news_rss(topic: str, ceid: str="KR:ko") -> str:
     q = quote_plus(topic)
     return f"https://news.google.com/rss/search?q={q}&hl=ko&gl=KR&ceid={ceid}"
 
-def fetch_news(topics: List[str], per_topic: int=3, ceid: str="KR:ko") -> List[Dict]:
+class HostThrottle:
+    """Per-host politeness limit: request starts to one host are spaced `interval` seconds apart."""
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next = {}
+
+    def wait(self, url: str):
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next.get(host, now))
+            self._next[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+_session = None
+_session_lock = threading.Lock()
+
+def get_session() -> requests.Session:
+    """Shared keep-alive session so all feeds reuse pooled connections to news.google.com."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            s = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(1, FETCH_WORKERS))
+            s.mount("https://", adapter)
+            s.mount("http://", adapter)
+            s.headers["User-Agent"] = feedparser.USER_AGENT
+            _session = s
+        return _session
+
+# When filtering against the seen index, parse this many times per_topic so unseen stories can backfill.
+SEEN_OVERFETCH = 3
+
+_feed_cache = None
+
+def get_feed_cache() -> Optional[FeedCache]:
+    global _feed_cache
+    if _feed_cache is None and FEED_CACHE_DIR:
+        _feed_cache = FeedCache(FEED_CACHE_DIR)
+    return _feed_cache
+
+def _parse_entries(feed, per_topic: int) -> List[Dict]:
     items = []
-    for t in topics:
-        url = google_news_rss(t, ceid=ceid)
-        feed = feedparser.parse(url)
-        for entry in feed.entries[:per_topic]:
-            link = clean_google_news_link(entry.link)
-            published = None
-            if hasattr(entry, 'published'):
-                try:
-                    published = dateparser.parse(entry.published)
-                except Exception:
-                    published = None
-            summary = BeautifulSoup(getattr(entry, "summary", ""), "html.parser").get_text(" ", strip=True)
-            items.append({
-                "topic": t,
-                "title": entry.get("title", ""),
-                "summary": summary,
-                "link": link,
-                "published": published.isoformat() if published else None,
-                "source": entry.get("source", {}).get("title") if hasattr(entry, "source") else None
-            })
-        time.sleep(0.2)
-    seen, deduped = set(), []
+    for entry in feed.entries[:per_topic]:
+        link = clean_google_news_link(entry.link)
+        published = None
+        if hasattr(entry, 'published'):
+            try:
+                published = dateparser.parse(entry.published)
+            except Exception:
+                published = None
+        summary = BeautifulSoup(getattr(entry, "summary", ""), "html.parser").get_text(" ", strip=True)
+        items.append({
+            "title": entry.get("title", ""),
+            "summary": summary,
+            "link": link,
+            "published": published.isoformat() if published else None,
+            "source": entry.get("source", {}).get("title") if hasattr(entry, "source") else None
+        })
+    return items
+
+def parse_feed(content: bytes, per_topic: int) -> Tuple[List[Dict], int]:
+    """Fast streaming path for Google News RSS; feedparser + BeautifulSoup for anything else."""
+    parsed = parse_google_news_rss(content, per_topic)
+    if parsed is not None:
+        return parsed
+    feed = feedparser.parse(content)
+    return _parse_entries(feed, per_topic), len(feed.entries)
+
+def _fetch_topic(topic: str, per_topic: int, ceid: str, throttle: HostThrottle, cache: Optional[FeedCache]) -> List[Dict]:
+    url = google_news_rss(topic, ceid=ceid)
+    cached = cache.get(url) if cache else None
+    headers = cache.validators(cached, per_topic) if cache else {}
+    throttle.wait(url)
+    try:
+        resp = get_session().get(url, headers=headers, timeout=FETCH_TIMEOUT)
+        if resp.status_code == 304 and headers:
+            # Unchanged since last run: skip both the download and the parse.
+            return [{"topic": topic, **e} for e in cached["entries"][:per_topic]]
+        resp.raise_for_status()
+    except requests.RequestException as e:
+        print(f"⚠️ 뉴스 피드 수집 실패 ({topic}): {e}")
+        return []
+    entries, total = parse_feed(resp.content, per_topic)
+    if cache:
+        cache.put(url, resp.headers.get("ETag"), resp.headers.get("Last-Modified"), entries, total)
+    return [{"topic": topic, **e} for e in entries]
+
+def _topic_fetcher(per_topic: int, ceid: str, use_cache: bool, seen: Optional[SeenStore]) -> Callable[[str], List[Dict]]:
+    throttle = HostThrottle(FETCH_HOST_INTERVAL)
+    cache = get_feed_cache() if use_cache else None
+    limit = per_topic * SEEN_OVERFETCH if seen else per_topic
+
+    def fetch(t):
+        entries = _fetch_topic(t, limit, ceid, throttle, cache)
+        if seen:
+            entries = seen.filter_unseen(entries)
+        return entries[:per_topic]
+    return fetch
+
+def _online_filter(near_dup_threshold: Optional[float]) -> Callable[[Dict], bool]:
+    """Streaming dedup: exact canonical link first, then near-duplicates; the first arrival wins."""
+    threshold = NEAR_DUP_THRESHOLD if near_dup_threshold is None else near_dup_threshold
+    index = NearDupIndex(threshold) if threshold > 0 else None
+    links = set()
+
+    def accept(it):
+        key = canonical_link(it["link"])
+        if key in links:
+            return False
+        links.add(key)
+        return index is None or index.add_if_new(it)
+    return accept
+
+def fetch_news(topics: List[str], per_topic: int=3, ceid: str="KR:ko", workers: Optional[int]=None,
+               use_cache: bool=True, seen: Optional[SeenStore]=None,
+               near_dup_threshold: Optional[float]=None) -> List[Dict]:
+    """Fetch topics concurrently (bounded by `workers`); items keep topic order, then feed order.
+    With `seen`, stories already briefed within its lookback window are dropped before truncation.
+    The same story from several outlets is collapsed to its best item (see dedup.dedupe_items)."""
+    workers = FETCH_WORKERS if workers is None else workers
+    fetch = _topic_fetcher(per_topic, ceid, use_cache, seen)
+    if workers <= 1 or len(topics) <= 1:
+        per_feed = [fetch(t) for t in topics]
+    else:
+        with ThreadPoolExecutor(max_workers=min(workers, len(topics))) as pool:
+            per_feed = list(pool.map(fetch, topics))
+    items = [it for feed_items in per_feed for it in feed_items]
+    links, deduped = set(), []
     for it in items:
-        if it["link"] in seen:
+        key = canonical_link(it["link"])
+        if key in links:
             continue
-        seen.add(it["link"])
+        links.add(key)
         deduped.append(it)
+    threshold = NEAR_DUP_THRESHOLD if near_dup_threshold is None else near_dup_threshold
+    if threshold > 0:
+        deduped = dedupe_items(deduped, threshold)
     return deduped[: max(1, per_topic*len(topics))]
+
+def iter_news(topics: List[str], per_topic: int=3, ceid: str="KR:ko", workers: Optional[int]=None,
+              use_cache: bool=True, seen: Optional[SeenStore]=None,
+              near_dup_threshold: Optional[float]=None) -> Iterator[Dict]:
+    """Streaming fetch_news: feeds are fetched concurrently but yielded in topic order, each as soon as
+    it and every earlier topic are done. Dedup runs online, so the first item of a near-duplicate
+    cluster in that order is kept; the choice is the same on every run."""
+    workers = FETCH_WORKERS if workers is None else workers
+    fetch = _topic_fetcher(per_topic, ceid, use_cache, seen)
+    accept = _online_filter(near_dup_threshold)
+    remaining = max(1, per_topic*len(topics))
+    pool = ThreadPoolExecutor(max_workers=max(1, min(workers, len(topics))))
+    try:
+        for fut in [pool.submit(fetch, t) for t in topics]:
+            for it in fut.result():
+                if accept(it):
+                    yield it
+                    remaining -= 1
+                    if remaining <= 0:
+                        return
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+async def aiter_news(topics: List[str], per_topic: int=3, ceid: str="KR:ko", workers: Optional[int]=None,
+                     use_cache: bool=True, seen: Optional[SeenStore]=None,
+                     near_dup_threshold: Optional[float]=None) -> AsyncIterator[Dict]:
+    """Async-iterator form of iter_news for event-loop consumers."""
+    workers = FETCH_WORKERS if workers is None else workers
+    fetch = _topic_fetcher(per_topic, ceid, use_cache, seen)
+    accept = _online_filter(near_dup_threshold)
+    remaining = max(1, per_topic*len(topics))
+    sem = asyncio.Semaphore(max(1, workers))
+
+    async def run(t):
+        async with sem:
+            return await asyncio.to_thread(fetch, t)
+
+    tasks = [asyncio.ensure_future(run(t)) for t in topics]
+    try:
+        for task in tasks:
+            for it in await task:
+                if accept(it):
+                    yield it
+                    remaining -= 1
+                    if remaining <= 0:
+                        return
+    finally:
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,57 @@
+import math
+from datetime import datetime, timezone
+from typing import List, Dict, Optional
+from config import RANK_HALF_LIFE_HOURS, NEAR_DUP_THRESHOLD
+from dedup import cluster_items, shingles, jaccard, item_quality, headline
+
+W_RECENCY = 1.0
+W_CLUSTER = 1.0     # how many outlets/topics carry the story
+W_SOURCE = 0.35     # penalty per already-selected story from the same outlet
+W_SIMILAR = 0.8     # penalty scaled by title similarity to already-selected stories
+UNDATED_RECENCY = 0.25
+
+def recency(item: Dict, now: datetime, half_life_hours: float) -> float:
+    if not item.get("published"):
+        return UNDATED_RECENCY
+    try:
+        published = datetime.fromisoformat(item["published"])
+    except ValueError:
+        return UNDATED_RECENCY
+    if published.tzinfo is None:
+        published = published.replace(tzinfo=timezone.utc)
+    age_hours = max(0.0, (now - published).total_seconds() / 3600)
+    return 0.5 ** (age_hours / half_life_hours)
+
+def rank_items(items: List[Dict], top_n: int, now: Optional[datetime]=None,
+               half_life_hours: float=RANK_HALF_LIFE_HOURS, threshold: float=NEAR_DUP_THRESHOLD) -> List[Dict]:
+    """Pick the top_n stories before any paid call, most important first.
+    Near-duplicates are clustered first (pass items that were not deduped so cluster sizes are real);
+    each cluster is scored on recency and size, then chosen greedily with penalties for repeating an
+    outlet or a headline that resembles one already chosen."""
+    if not items or top_n <= 0:
+        return []
+    now = now or datetime.now(timezone.utc)
+    clusters = cluster_items(items, threshold) if threshold > 0 else [[i] for i in range(len(items))]
+    largest = max(len(c) + len({items[i]["topic"] for i in c}) for c in clusters)
+    candidates = []
+    for cluster in clusters:
+        rep = items[max(cluster, key=lambda i: (item_quality(items[i]), -i))]
+        # Cross-topic stories count extra: they surfaced under several searches.
+        spread = len(cluster) + len({items[i]["topic"] for i in cluster})
+        score = (W_RECENCY * recency(rep, now, half_life_hours)
+                 + W_CLUSTER * math.log1p(spread - 2) / math.log1p(max(1, largest - 2)))
+        candidates.append((score, rep, shingles(headline(rep))))
+
+    selected, selected_sh, sources = [], [], {}
+    while candidates and len(selected) < top_n:
+        def adjusted(c):
+            score, rep, sh = c
+            sim = max((jaccard(sh, s) for s in selected_sh), default=0.0)
+            return score - W_SOURCE * sources.get(rep.get("source"), 0) - W_SIMILAR * sim
+        best = max(range(len(candidates)), key=lambda k: (adjusted(candidates[k]), -k))
+        _, rep, sh = candidates.pop(best)
+        selected.append(rep)
+        selected_sh.append(sh)
+        if rep.get("source"):
+            sources[rep["source"]] = sources.get(rep["source"], 0) + 1
+    return selected
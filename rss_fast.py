@@ -0,0 +1,76 @@
+import io
+import xml.etree.ElementTree as ET
+from email.utils import parsedate_to_datetime
+from html.parser import HTMLParser
+from typing import List, Dict, Optional, Tuple
+from utils import clean_google_news_link
+
+class _TextExtractor(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+
+    def handle_data(self, data):
+        data = data.strip()
+        if data:
+            self.parts.append(data)
+
+def html_to_text(html: str) -> str:
+    """Same output as BeautifulSoup(html, "html.parser").get_text(" ", strip=True) for feed snippets."""
+    if "<" not in html and "&" not in html:
+        return html.strip()
+    p = _TextExtractor()
+    p.feed(html)
+    p.close()
+    return " ".join(p.parts)
+
+def parse_date(value: str):
+    # RFC 822 is all Google News ever sends; dateutil only for anything else.
+    try:
+        return parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        pass
+    try:
+        from dateutil import parser as dateparser
+        return dateparser.parse(value)
+    except Exception:
+        return None
+
+def parse_google_news_rss(content: bytes, limit: Optional[int]=None) -> Optional[Tuple[List[Dict], int]]:
+    """Streaming parse of a Google News RSS document into (entries, total_items).
+    Entries match news_fetcher._parse_entries; returns None for anything that is not a
+    well-formed Google News RSS 2.0 feed so the caller can fall back to feedparser."""
+    entries, total = [], 0
+    channel_link = None
+    try:
+        events = ET.iterparse(io.BytesIO(content), events=("start", "end"))
+        event, root = next(events)
+        if root.tag != "rss":
+            return None
+        for event, el in events:
+            if event != "end":
+                continue
+            if el.tag == "link" and channel_link is None and total == 0:
+                channel_link = el.text or ""
+            elif el.tag == "item":
+                if total == 0 and "news.google.com" not in (channel_link or ""):
+                    return None
+                total += 1
+                if limit is None or len(entries) < limit:
+                    entries.append(_item_to_entry(el))
+                el.clear()
+    except (ET.ParseError, StopIteration):
+        return None
+    return entries, total
+
+def _item_to_entry(el) -> Dict:
+    published = el.findtext("pubDate")
+    published = parse_date(published) if published else None
+    source = el.find("source")
+    return {
+        "title": el.findtext("title") or "",
+        "summary": html_to_text(el.findtext("description") or ""),
+        "link": clean_google_news_link(el.findtext("link") or ""),
+        "published": published.isoformat() if published else None,
+        "source": source.text if source is not None else None,
+    }
@@ -0,0 +1,52 @@
+import sqlite3, threading, time
+from pathlib import Path
+from typing import List, Dict, Optional, Iterable
+from config import SEEN_DB_PATH, SEEN_LOOKBACK_DAYS
+from utils import canonical_link, title_hash
+
+class SeenStore:
+    """SQLite index of articles already briefed, keyed by canonical link and title hash."""
+    def __init__(self, db_path: str, lookback_days: float=3.0):
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.lookback = lookback_days * 86400
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute("CREATE TABLE IF NOT EXISTS seen ("
+                               "link TEXT PRIMARY KEY, title_hash TEXT NOT NULL, seen_at REAL NOT NULL)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_seen_title ON seen(title_hash)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_seen_at ON seen(seen_at)")
+
+    def _cutoff(self) -> float:
+        return time.time() - self.lookback if self.lookback > 0 else 0.0
+
+    def is_seen(self, item: Dict) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM seen WHERE (link = ? OR title_hash = ?) AND seen_at >= ? LIMIT 1",
+                (canonical_link(item["link"]), title_hash(item["title"]), self._cutoff())).fetchone()
+        return row is not None
+
+    def filter_unseen(self, items: Iterable[Dict]) -> List[Dict]:
+        return [it for it in items if not self.is_seen(it)]
+
+    def mark_seen(self, items: Iterable[Dict]):
+        now = time.time()
+        rows = [(canonical_link(it["link"]), title_hash(it["title"]), now) for it in items]
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO seen (link, title_hash, seen_at) VALUES (?, ?, ?)", rows)
+
+    def prune(self) -> int:
+        """Drop rows older than the lookback window; returns the number removed."""
+        with self._lock, self._conn:
+            return self._conn.execute("DELETE FROM seen WHERE seen_at < ?", (self._cutoff(),)).rowcount
+
+    def close(self):
+        self._conn.close()
+
+def get_seen_store() -> Optional[SeenStore]:
+    if not SEEN_DB_PATH:
+        return None
+    store = SeenStore(SEEN_DB_PATH, SEEN_LOOKBACK_DAYS)
+    store.prune()
+    return store
@@ -1,40 +1,223 @@
-from typing import List, Dict
-from openai import OpenAI
-from config import OPENAI_API_KEY, OPENAI_TEXT_MODEL
+import json, asyncio
+from itertools import islice
+from typing import List, Dict, Iterable, Iterator, Optional, Union, AsyncIterable
+from openai import OpenAI, AsyncOpenAI
+from config import (OPENAI_API_KEY, OPENAI_TEXT_MODEL, SUMMARY_BATCH_SIZE, SUMMARY_CONCURRENCY,
+                    SUMMARY_TIMEOUT, SUMMARY_MAX_RETRIES)
+from summary_cache import SummaryCache, get_summary_cache
+from utils import aretry_call, is_retryable_openai
 
 client = OpenAI(api_key=OPENAI_API_KEY)
+# Retries are ours (utils.aretry_call, full-jitter backoff), not the SDK's.
+aclient = AsyncOpenAI(api_key=OPENAI_API_KEY, max_retries=0)
 
 SYS = "음성 뉴스 대본 작성자입니다. 각 뉴스를 2~3문장으로 핵심만 요약하고, 일반인이 이해하기 쉬운 한 문장 해설을 덧붙이세요. 과장 금지, 출처 언급."
 
-def summarize_items(items: List[Dict]) -> List[Dict]:
-    """Return list with added fields: 'bullet', 'explain', 'caption'"""
-    out = []
-    for it in items:
-        content = f"""제목: {it['title']}
+def _article(it: Dict) -> str:
+    return f"""제목: {it['title']}
 요약(원문): {it['summary']}
 링크: {it['link']}"""
-        prompt = (
-            "다음 기사를 한국어로 2~3문장 브리핑 + 1문장 해설로 압축해 주세요.\n"
-            "출력 JSON 키는 bullet(요약), explain(해설), caption(영상 자막용 2줄) 입니다.\n"
-            "JSON만 출력:\n"
-            f"{content}"
-        )
-        resp = client.chat.completions.create(
-            model=OPENAI_TEXT_MODEL,
-            messages=[
-                {"role":"system", "content": SYS},
-                {"role":"user", "content": prompt}
-            ],
-            temperature=0.3,
-            response_format={"type":"json_object"},
-        )
-        data = resp.choices[0].message.content
-        import json
+
+def build_prompt(it: Dict) -> str:
+    return (
+        "다음 기사를 한국어로 2~3문장 브리핑 + 1문장 해설로 압축해 주세요.\n"
+        "출력 JSON 키는 bullet(요약), explain(해설), caption(영상 자막용 2줄) 입니다.\n"
+        "JSON만 출력:\n"
+        f"{_article(it)}"
+    )
+
+def build_batch_prompt(batch: List[Dict]) -> str:
+    articles = "\n\n".join(f"[기사 {i}]\n{_article(it)}" for i, it in enumerate(batch, start=1))
+    return (
+        f"다음 기사 {len(batch)}개를 각각 한국어로 2~3문장 브리핑 + 1문장 해설로 압축해 주세요.\n"
+        "출력 JSON은 {\"items\": [...]} 형태이며, 배열 원소마다 키는 id(기사 번호), bullet(요약), "
+        "explain(해설), caption(영상 자막용 2줄) 입니다. 모든 기사를 번호 순서대로 포함하세요.\n"
+        "JSON만 출력:\n"
+        f"{articles}"
+    )
+
+def _request(prompt: str) -> Dict:
+    return dict(
+        model=OPENAI_TEXT_MODEL,
+        messages=[
+            {"role":"system", "content": SYS},
+            {"role":"user", "content": prompt}
+        ],
+        temperature=0.3,
+        response_format={"type":"json_object"},
+    )
+
+def _complete(prompt: str) -> str:
+    resp = client.chat.completions.create(**_request(prompt))
+    return resp.choices[0].message.content
+
+async def _acomplete(prompt: str, timeout: float) -> str:
+    async def attempt():
+        resp = await aclient.chat.completions.create(**_request(prompt), timeout=timeout)
+        return resp.choices[0].message.content
+    return await aretry_call(attempt, SUMMARY_MAX_RETRIES, 30.0, "요약 요청", is_retryable_openai)
+
+def _is_valid(j) -> bool:
+    return (isinstance(j, dict)
+            and all(isinstance(j.get(k), str) and j[k].strip() for k in ("bullet", "explain")))
+
+def _parse_one(data: str) -> Optional[Dict]:
+    """A single-article reply if it parses and has non-empty bullet/explain, else None."""
+    try:
         j = json.loads(data)
-        it.update({
-            "bullet": j.get("bullet"),
-            "explain": j.get("explain"),
-            "caption": j.get("caption", j.get("bullet"))
-        })
-        out.append(it)
+    except ValueError:
+        return None
+    return j if _is_valid(j) else None
+
+def _invalid(it: Dict) -> ValueError:
+    return ValueError(f"요약 응답이 {SUMMARY_MAX_RETRIES + 1}회 모두 유효하지 않음: {it['title']}")
+
+def _apply(it: Dict, j: Dict):
+    it.update({
+        "bullet": j.get("bullet"),
+        "explain": j.get("explain"),
+        "caption": j.get("caption", j.get("bullet"))
+    })
+
+def cache_key(it: Dict) -> str:
+    return SummaryCache.make_key(OPENAI_TEXT_MODEL, SYS, build_prompt(it), it["title"], it["summary"], it["link"])
+
+def _cached(batch: List[Dict], cache: Optional[SummaryCache]) -> List[Dict]:
+    """Fill cache hits in place; returns the items that still need a request."""
+    if cache is None:
+        return batch
+    misses = []
+    for it in batch:
+        j = cache.get(cache_key(it), _is_valid)  # a bad entry stored before validation is dropped
+        if j is None:
+            misses.append(it)
+        else:
+            _apply(it, j)
+    return misses
+
+def _store(batch: List[Dict], cache: Optional[SummaryCache]):
+    if cache is None:
+        return
+    for it in batch:
+        # Never cache a bad answer: it would outlive every rerun and retry
+        if _is_valid(it):
+            cache.put(cache_key(it), {k: it[k] for k in ("bullet", "explain", "caption")})
+
+def _batch_results(batch: List[Dict], data: str) -> List[Optional[Dict]]:
+    """Match the returned array to the batch by id (or by position if ids are missing)."""
+    try:
+        results = json.loads(data).get("items")
+    except (ValueError, AttributeError):
+        return [None] * len(batch)
+    if not isinstance(results, list):
+        return [None] * len(batch)
+    by_id = {r.get("id"): r for r in results if isinstance(r, dict) and "id" in r}
+    if not by_id and len(results) == len(batch):
+        return results
+    out = []
+    for i in range(1, len(batch) + 1):
+        out.append(by_id.get(i, by_id.get(str(i))))
     return out
+
+def _summarize_one(it: Dict):
+    """Request until the reply is valid (up to SUMMARY_MAX_RETRIES more times), then ValueError."""
+    for attempt in range(SUMMARY_MAX_RETRIES + 1):
+        j = _parse_one(_complete(build_prompt(it)))
+        if j is not None:
+            _apply(it, j)
+            return
+        if attempt < SUMMARY_MAX_RETRIES:
+            print(f"⚠️ 요약 응답 형식 오류, 재요청 {attempt + 1}/{SUMMARY_MAX_RETRIES}: {it['title']}")
+    raise _invalid(it)
+
+def _apply_batch(batch: List[Dict], data: str) -> List[Dict]:
+    """Fill the batch from one response; returns the items whose entry was missing or invalid."""
+    failed = []
+    for it, j in zip(batch, _batch_results(batch, data)):
+        if _is_valid(j):
+            _apply(it, j)
+        else:
+            failed.append(it)
+    return failed
+
+def _summarize_batch(batch: List[Dict]) -> List[Dict]:
+    return _apply_batch(batch, _complete(build_batch_prompt(batch)))
+
+def _chunks(items: Iterable[Dict], size: int) -> Iterator[List[Dict]]:
+    it = iter(items)
+    while True:
+        batch = list(islice(it, size))
+        if not batch:
+            return
+        yield batch
+
+def summarize_items(items: Iterable[Dict], batch_size: Optional[int]=None, use_cache: bool=True) -> List[Dict]:
+    """Return list with added fields: 'bullet', 'explain', 'caption'. `items` may be a generator (see iter_news).
+    With batch_size > 1, articles are packed into one request per batch; only the items that come back
+    invalid are retried (once as a smaller batch, then one by one). Cached summaries skip the API."""
+    batch_size = SUMMARY_BATCH_SIZE if batch_size is None else batch_size
+    cache = get_summary_cache() if use_cache else None
+    out = []
+    for batch in _chunks(items, max(1, batch_size)):
+        todo = _cached(batch, cache)
+        failed = todo if len(todo) <= 1 else _summarize_batch(todo)
+        if len(failed) > 1:
+            failed = _summarize_batch(failed)
+        for it in failed:
+            _summarize_one(it)
+        _store(todo, cache)
+        out.extend(batch)
+    return out
+
+async def _achunks(items: Union[Iterable[Dict], AsyncIterable[Dict]], size: int):
+    if not hasattr(items, "__aiter__"):
+        for batch in _chunks(items, size):
+            yield batch
+        return
+    batch = []
+    async for it in items:
+        batch.append(it)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+async def asummarize_items(items: Union[Iterable[Dict], AsyncIterable[Dict]], batch_size: Optional[int]=None,
+                           concurrency: Optional[int]=None, timeout: Optional[float]=None,
+                           use_cache: bool=True) -> List[Dict]:
+    """Concurrent summarize_items: at most `concurrency` requests in flight, results in input order.
+    `items` may also be an async iterator (see aiter_news); requests start as batches fill up."""
+    batch_size = max(1, SUMMARY_BATCH_SIZE if batch_size is None else batch_size)
+    cache = get_summary_cache() if use_cache else None
+    sem = asyncio.Semaphore(max(1, SUMMARY_CONCURRENCY if concurrency is None else concurrency))
+    timeout = SUMMARY_TIMEOUT if timeout is None else timeout
+
+    async def one(it):
+        for attempt in range(SUMMARY_MAX_RETRIES + 1):
+            async with sem:
+                j = _parse_one(await _acomplete(build_prompt(it), timeout))
+            if j is not None:
+                _apply(it, j)
+                return
+            if attempt < SUMMARY_MAX_RETRIES:
+                print(f"⚠️ 요약 응답 형식 오류, 재요청 {attempt + 1}/{SUMMARY_MAX_RETRIES}: {it['title']}")
+        raise _invalid(it)
+
+    async def batched(batch):
+        todo = failed = _cached(batch, cache)
+        for _ in range(2):
+            if len(failed) <= 1:
+                break
+            async with sem:
+                data = await _acomplete(build_batch_prompt(failed), timeout)
+            failed = _apply_batch(failed, data)
+        await asyncio.gather(*(one(it) for it in failed))
+        _store(todo, cache)
+
+    batches, tasks = [], []
+    async for batch in _achunks(items, batch_size):
+        batches.append(batch)
+        tasks.append(asyncio.ensure_future(batched(batch)))
+    await asyncio.gather(*tasks)
+    return [it for batch in batches for it in batch]
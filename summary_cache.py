@@ -0,0 +1,62 @@
+import json, sqlite3, hashlib, threading, time
+from pathlib import Path
+from typing import Callable, Dict, Optional
+from config import SUMMARY_CACHE_PATH, SUMMARY_CACHE_MAX_ENTRIES
+
+class SummaryCache:
+    """Content-addressed store of summaries with LRU eviction beyond `max_entries`."""
+    def __init__(self, db_path: str, max_entries: int=5000):
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.hits = self.misses = self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute("CREATE TABLE IF NOT EXISTS summaries ("
+                               "key TEXT PRIMARY KEY, value TEXT NOT NULL, last_used REAL NOT NULL)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_summaries_used ON summaries(last_used)")
+
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        return hashlib.sha256(json.dumps(parts, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+    def get(self, key: str, valid: Optional[Callable[[Dict], bool]]=None) -> Optional[Dict]:
+        """The stored value, or None. An entry rejected by `valid` (or unreadable) is deleted and
+        counted as a miss, so hits only count answers that save a request."""
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT value FROM summaries WHERE key = ?", (key,)).fetchone()
+            try:
+                value = json.loads(row[0]) if row else None
+            except ValueError:
+                value = None
+            if value is not None and valid is not None and not valid(value):
+                value = None
+            if value is None:
+                if row is not None:
+                    self._conn.execute("DELETE FROM summaries WHERE key = ?", (key,))
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._conn.execute("UPDATE summaries SET last_used = ? WHERE key = ?", (time.time(), key))
+        return value
+
+    def put(self, key: str, value: Dict):
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO summaries (key, value, last_used) VALUES (?, ?, ?)",
+                               (key, json.dumps(value, ensure_ascii=False), time.time()))
+            excess = self._conn.execute("SELECT COUNT(*) FROM summaries").fetchone()[0] - self.max_entries
+            if excess > 0:
+                self._conn.execute("DELETE FROM summaries WHERE key IN "
+                                   "(SELECT key FROM summaries ORDER BY last_used ASC LIMIT ?)", (excess,))
+                self.evictions += excess
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+_cache = None
+
+def get_summary_cache() -> Optional[SummaryCache]:
+    global _cache
+    if _cache is None and SUMMARY_CACHE_PATH:
+        _cache = SummaryCache(SUMMARY_CACHE_PATH, SUMMARY_CACHE_MAX_ENTRIES)
+    return _cache
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+MP3 프레임 복사 연결 테스트 (네트워크/디코딩 불필요)
+test_audio 세그먼트를 이어 붙여 시작 위치, 전체 길이, Info 프레임 값을 확인
+"""
+
+import tempfile
+from pathlib import Path
+from audio_probe import audio_duration, mp3_frames, mp3_header, first_frame, _info_frames
+from audio_utils import concat_mp3_frames, _info_frame, _silent_frame
+
+FRAME = 576 / 24000  # 24kHz MPEG-2 Layer III 프레임 길이 (0.024초)
+SEGMENTS = sorted(Path("test_audio").glob("seg_*.mp3"))
+
+def test_concat_frames():
+    """시작 위치는 프레임 격자 위, 이상적인 위치와 반 프레임 이내; 전체 길이 = Info 프레임 값 = 실제 프레임 수"""
+    print("🔗 세그먼트 연결 테스트 중...")
+    out = Path(tempfile.mkdtemp()) / "narration.mp3"
+    lead_in, gap = 0.5, 0.25
+    total, starts = concat_mp3_frames([str(p) for p in SEGMENTS], str(out), lead_in, gap)
+
+    durations = [audio_duration(p) for p in SEGMENTS]
+    ideal = lead_in
+    for start, duration in zip(starts, durations):
+        assert abs(start / FRAME - round(start / FRAME)) < 1e-6, start
+        assert abs(start - ideal) <= FRAME / 2 + 1e-9, (start, ideal)
+        ideal += duration + gap
+    assert abs(total - ideal) <= FRAME / 2 + 1e-9, (total, ideal)
+
+    b = out.read_bytes()
+    counted = sum(samples for _, _, samples in mp3_frames(b)) / 24000
+    assert _info_frames(b, first_frame(b)) is not None, "Info 프레임 없음"
+    assert abs(audio_duration(out) - total) < 1e-9 and abs(counted - total) < 1e-9, (audio_duration(out), counted, total)
+    print(f"   ✅ 시작 {', '.join(f'{s:.3f}' for s in starts)}초, 전체 {total:.3f}초")
+
+def test_info_frame_low_bitrate():
+    """8kbps 프레임(24바이트)에는 Info 태그가 들어가지 않으므로 더 큰 비트레이트로 기록"""
+    print("📦 저비트레이트 Info 프레임 테스트 중...")
+    header = bytes([0xFF, 0xF3, 0x14, 0xC4])  # MPEG-2 Layer III, 8kbps, 24kHz, 모노
+    assert len(_silent_frame(header)) == 24
+    frame = _info_frame(header, 1234)
+    length = mp3_header(frame, 0)[0]
+    assert length == len(frame) and frame[13:17] == b"Info", (length, len(frame))
+    assert _info_frames(frame + _silent_frame(header), 0) == 1234
+    print(f"   ✅ Info 프레임 {len(frame)}바이트")
+
+def main():
+    print("🚀 MP3 연결 테스트 시작")
+    print("=" * 50)
+    test_concat_frames()
+    test_info_frame_low_bitrate()
+    print("\n🎉 모든 MP3 연결 테스트 통과!")
+
+if __name__ == "__main__":
+    main()
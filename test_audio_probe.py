@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+오디오 길이 측정 테스트 (ffmpeg/pydub 불필요)
+MP3 프레임 헤더와 WAV 헤더만으로 길이를 계산하는지 확인
+"""
+
+import wave
+import tempfile
+from pathlib import Path
+from audio_probe import probe_audio, audio_duration
+
+def test_mp3_segments():
+    """test_audio의 세그먼트 길이 측정 (24kHz 모노, 576 샘플/프레임)"""
+    print("🎵 MP3 세그먼트 길이 측정 중...")
+    expected = {"seg_01.mp3": 2.952, "seg_02.mp3": 1.512, "seg_03.mp3": 2.856}
+    for name, seconds in expected.items():
+        info = probe_audio(Path("test_audio") / name)
+        assert info.codec == "mp3" and info.sample_rate == 24000 and info.channels == 1, info
+        assert abs(info.duration - seconds) < 1e-9, (name, info.duration)
+        print(f"   ✅ {name}: {info.duration:.3f}초")
+
+def test_concatenated_mp3():
+    """단순 연결된 test_narration.mp3 = 세그먼트 길이 합"""
+    print("🔗 연결된 MP3 길이 측정 중...")
+    total = sum(audio_duration(p) for p in sorted(Path("test_audio").glob("seg_*.mp3")))
+    assert abs(audio_duration("test_narration.mp3") - total) < 1e-9
+    print(f"   ✅ test_narration.mp3: {total:.3f}초")
+
+def test_wav_header():
+    """WAV 헤더 기반 길이 측정"""
+    print("🌊 WAV 길이 측정 중...")
+    path = Path(tempfile.mkdtemp()) / "tone.wav"
+    with wave.open(str(path), "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(24000)
+        w.writeframes(b"\0\0" * 36000)
+    info = probe_audio(path)
+    assert info.codec == "pcm_s16le" and abs(info.duration - 1.5) < 1e-9, info
+    print(f"   ✅ {path.name}: {info.duration:.3f}초")
+
+def main():
+    print("🚀 오디오 길이 측정 테스트 시작")
+    print("=" * 50)
+    test_mp3_segments()
+    test_concatenated_mp3()
+    test_wav_header()
+    print("\n🎉 모든 오디오 길이 측정 테스트 통과!")
+
+if __name__ == "__main__":
+    main()
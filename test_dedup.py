@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+유사 기사 중복 제거 테스트 (네트워크 불필요)
+같은 사건을 다룬 다른 언론사 기사가 하나로 합쳐지는지 확인
+"""
+
+from dedup import cluster_items, dedupe_items, NearDupIndex
+
+SAMPLE_ITEMS = [
+    {"title": "트럼프 \"종전 안 되면 러시아에 경제전쟁\"…제재 강화 경고 - 연합뉴스", "summary": "",
+     "source": "연합뉴스", "published": None},
+    {"title": "트럼프, 종전 합의 실패하면 러시아에 강력 제재 경고 - 조선일보",
+     "summary": "트럼프, 종전 합의 실패하면 러시아에 강력 제재 경고 조선일보",
+     "source": "조선일보", "published": "2025-08-27T07:00:00+00:00"},
+    {"title": "인도·필리핀 IT 아웃소싱, AI 확산에 대규모 해고 - 한국경제", "summary": "",
+     "source": "한국경제", "published": None},
+    {"title": "쌀값 지탱에 매년 2조원 투입…재고 남아도 가격 상승 - 한겨레", "summary": "",
+     "source": "한겨레", "published": None},
+]
+
+def test_near_duplicate_clusters():
+    """같은 사건 기사 1, 2번이 한 묶음이 되는지"""
+    print("🔍 유사 기사 묶음 테스트 중...")
+    clusters = cluster_items(SAMPLE_ITEMS)
+    assert clusters == [[0, 1], [2], [3]], clusters
+    print(f"✅ 묶음: {clusters}")
+
+def test_best_representative():
+    """묶음 대표로 발행 시각/출처 정보가 있는 기사가 남는지"""
+    print("🏆 대표 기사 선택 테스트 중...")
+    deduped = dedupe_items(SAMPLE_ITEMS)
+    assert len(deduped) == 3
+    assert deduped[0] is SAMPLE_ITEMS[1]
+    print(f"✅ 대표 기사: {deduped[0]['title']}")
+
+def test_online_index():
+    """스트리밍(온라인) 중복 제거는 먼저 들어온 기사를 유지"""
+    print("📡 온라인 인덱스 테스트 중...")
+    index = NearDupIndex()
+    kept = [it for it in SAMPLE_ITEMS if index.add_if_new(it)]
+    assert [it["source"] for it in kept] == ["연합뉴스", "한국경제", "한겨레"]
+    print(f"✅ 유지된 기사 {len(kept)}개")
+
+def main():
+    print("🚀 중복 제거 테스트 시작")
+    print("=" * 50)
+    test_near_duplicate_clusters()
+    test_best_representative()
+    test_online_index()
+    print("\n🎉 모든 중복 제거 테스트 통과!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+뉴스 순위 선정 테스트 (네트워크/API 불필요)
+여러 언론사·주제에 걸친 기사 우대, 같은 언론사 반복과 비슷한 헤드라인 감점 확인
+"""
+
+from datetime import datetime, timedelta, timezone
+from ranker import rank_items
+from utils import title_hash
+
+NOW = datetime(2025, 8, 27, 9, 0, tzinfo=timezone.utc)
+
+def item(title, source, topic="정치", hours_ago=0.0):
+    published = (NOW - timedelta(hours=hours_ago)).isoformat()
+    return {"title": f"{title} - {source}", "summary": "", "source": source, "topic": topic,
+            "link": f"https://news.example/{source}/{title_hash(title)}", "published": published}
+
+def test_cluster_outranks_singleton():
+    """여러 언론사·주제에서 다룬 사건이 더 최신인 단독 기사보다 먼저"""
+    print("📰 묶음 기사 우선순위 테스트 중...")
+    items = [
+        item("쌀값 지탱에 매년 2조원 투입 재고 남아도 가격 상승", "한겨레", "경제"),
+        item("트럼프 종전 안 되면 러시아에 경제전쟁 제재 강화 경고", "연합뉴스", "국제", hours_ago=2),
+        item("트럼프 종전 안 되면 러시아에 경제전쟁 제재 강화 경고", "조선일보", "정치", hours_ago=2),
+        item("트럼프 종전 안 되면 러시아에 경제전쟁 제재 강화 경고", "한국경제", "경제", hours_ago=2),
+    ]
+    ranked = rank_items(items, 2, now=NOW)
+    assert len(ranked) == 2 and "트럼프" in ranked[0]["title"], [it["title"] for it in ranked]
+    assert "쌀값" in ranked[1]["title"]
+    print(f"✅ 1위: {ranked[0]['title']}")
+
+def test_repeated_source_penalty():
+    """같은 언론사 두 번째 기사는 조금 더 오래된 다른 언론사 기사에 밀림"""
+    print("🏷️ 언론사 반복 감점 테스트 중...")
+    items = [
+        item("한미일 북한 IT 인력 공동성명 발표", "연합뉴스"),
+        item("인도 필리핀 IT 아웃소싱 AI 확산에 대규모 해고", "연합뉴스"),
+        item("서울 아파트 거래량 석 달 연속 감소", "한겨레", hours_ago=1),
+    ]
+    ranked = rank_items(items, 3, now=NOW, threshold=0)
+    assert [it["source"] for it in ranked] == ["연합뉴스", "한겨레", "연합뉴스"], [it["title"] for it in ranked]
+    print(f"✅ 순서: {', '.join(it['source'] for it in ranked)}")
+
+def test_similar_headline_penalty():
+    """묶이지 않은 거의 같은 헤드라인은 다른 사건보다 뒤로"""
+    print("🔁 비슷한 헤드라인 감점 테스트 중...")
+    items = [
+        item("중국 경제 부진 속 증시는 상승세 10년 만의 괴리", "연합뉴스"),
+        item("중국 경제 부진 속 증시는 상승세 10년 만에 괴리", "조선일보"),
+        item("폭염 속 전력 수요 역대 최고치 경신", "한겨레", hours_ago=3),
+    ]
+    # threshold=0: 묶음을 만들지 않아 두 헤드라인이 각각 후보로 남음
+    ranked = rank_items(items, 2, now=NOW, threshold=0)
+    assert [it["source"] for it in ranked] == ["연합뉴스", "한겨레"], [it["title"] for it in ranked]
+    print(f"✅ 2위: {ranked[1]['title']}")
+
+def test_edge_cases():
+    """빈 입력, top_n 0, 후보보다 큰 top_n"""
+    print("🧪 경계 조건 테스트 중...")
+    items = [item("한미일 북한 IT 인력 공동성명 발표", "연합뉴스")]
+    assert rank_items([], 3, now=NOW) == [] and rank_items(items, 0, now=NOW) == []
+    assert rank_items(items, 5, now=NOW) == items
+    print("✅ 경계 조건 정상")
+
+def main():
+    print("🚀 뉴스 순위 테스트 시작")
+    print("=" * 50)
+    test_cluster_outranks_singleton()
+    test_repeated_source_penalty()
+    test_similar_headline_penalty()
+    test_edge_cases()
+    print("\n🎉 모든 순위 테스트 통과!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+PIL 텍스트 렌더러 테스트 (ImageMagick 불필요)
+줄바꿈, 정렬, 메모이제이션, 레이어 합성 확인
+"""
+
+import numpy as np
+from text_render import load_font, wrap_text, render_text
+from video_engine import composite
+
+def test_wrap():
+    """지정한 폭을 넘지 않도록 줄바꿈 (띄어쓰기 없는 긴 한글도 글자 단위로 분리)"""
+    print("📏 줄바꿈 테스트 중...")
+    font = load_font(32)
+    for text in ["중국의 경제가 부진한 가운데 증시는 상승세를 보이며 10년 만에 괴리가 발생하고 있습니다.",
+                 "띄어쓰기없이아주길게이어지는한글문장도폭안에들어가야합니다" * 2]:
+        lines = wrap_text(text, font, 300)
+        assert len(lines) > 1 and all(font.getlength(l) <= 300 for l in lines), lines
+        assert "".join(lines).replace(" ", "") == text.replace(" ", "")
+        print(f"   ✅ {len(lines)}줄")
+
+def test_render():
+    """RGBA 레이어 크기와 메모이제이션"""
+    print("🖋️ 텍스트 레이어 생성 테스트 중...")
+    layer = render_text("1. 한미일 북한 IT 인력 공동성명", 36, 500)
+    assert layer.shape[1] == 500 and layer.shape[2] == 4 and layer.dtype == np.uint8
+    assert layer[..., 3].max() == 255 and layer[..., 3].min() == 0
+    assert render_text("1. 한미일 북한 IT 인력 공동성명", 36, 500) is layer
+    right = render_text("NEWS", 36, 500, align="right")
+    assert np.nonzero(right[..., 3])[1].min() > 250
+    print(f"   ✅ {layer.shape[1]}x{layer.shape[0]} RGBA, 캐시 재사용")
+
+def test_composite():
+    """투명 영역은 배경 유지, 불투명 영역은 글자색"""
+    print("🧩 레이어 합성 테스트 중...")
+    bg = np.full((200, 600, 3), 30, dtype=np.uint8)
+    layer = render_text("뉴스 브리핑", 48, 560)
+    frame = composite(bg, [{"image": layer, "pos": (20, 40)}])
+    alpha = layer[..., 3]
+    region = frame[40:40 + layer.shape[0], 20:580]
+    assert (region[alpha == 0] == 30).all() and (region[alpha == 255] == 255).all()
+    assert (frame[:40] == 30).all() and (bg == 30).all()
+    # 화면 밖으로 나간 레이어도 잘려서 합성
+    composite(bg, [{"image": layer, "pos": (400, 180)}, {"image": layer, "pos": (-700, 0)}])
+    print("   ✅ 합성 결과 정상")
+
+def main():
+    print("🚀 텍스트 렌더러 테스트 시작\n")
+    test_wrap()
+    test_render()
+    test_composite()
+    print("\n🎉 모든 테스트 통과!")
+
+if __name__ == "__main__":
+    main()
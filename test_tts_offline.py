@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+오프라인 TTS 백엔드로 문장 단위 합성 + 무음 제거 테스트 (네트워크/API 불필요)
+pcm 모드와 mp3 모드가 같은 길이, 같은 문장 타이밍을 내는지 확인
+"""
+
+import tempfile
+import numpy as np
+from tts_openai import synthesize_segments
+from tts_backends import OfflineTTSBackend
+from audio_probe import audio_duration
+
+PAD = 0.5  # 문장마다 앞뒤로 붙는 무음 (초)
+MP3_SLACK = 0.1  # MP3 인코더 지연/패딩 + 프레임 반올림 여유
+
+class PaddedBackend(OfflineTTSBackend):
+    """문장 앞뒤에 무음이 붙는 TTS 흉내"""
+    def pcm(self, text):
+        pad = np.zeros(int(PAD * self.sample_rate), dtype=np.int16)
+        return np.concatenate([pad, super().pcm(text), pad])
+
+SEGMENTS = ["1번 뉴스. 중국의 경제가 부진한 가운데 증시는 상승세를 보이고 있습니다. 전문가들은 불균형을 경고합니다."]
+
+def synthesize(fmt):
+    return synthesize_segments(SEGMENTS, tempfile.mkdtemp(), fmt=fmt, backend=PaddedBackend(),
+                               use_cache=False, sentence_chunks=True, trim=True)[0]
+
+def test_trim_pcm_vs_mp3():
+    """mp3 파일에도 무음 제거가 반영되어 pcm 모드와 길이/문장 위치가 일치"""
+    print("✂️ 무음 제거 pcm/mp3 비교 중...")
+    pcm, mp3 = synthesize("pcm"), synthesize("mp3")
+    assert pcm["trimmed"] > PAD and mp3["trimmed"] == pcm["trimmed"], (pcm.get("trimmed"), mp3.get("trimmed"))
+    assert abs(audio_duration(mp3["file"]) - mp3["duration"]) < 1e-9
+    assert abs(mp3["duration"] - pcm["duration"]) < MP3_SLACK, (mp3["duration"], pcm["duration"])
+    for a, b in zip(pcm["sentences"], mp3["sentences"]):
+        assert (a["start"], a["end"], a["text"]) == (b["start"], b["end"], b["text"]), (a, b)
+        assert 0.0 <= a["start"] < a["end"] <= pcm["duration"] + 1e-9
+    print(f"   ✅ pcm {pcm['duration']:.3f}초 / mp3 {mp3['duration']:.3f}초, 제거된 무음 {pcm['trimmed']:.3f}초")
+
+def main():
+    print("🚀 오프라인 TTS 테스트 시작")
+    print("=" * 50)
+    test_trim_pcm_vs_mp3()
+    print("\n🎉 모든 오프라인 TTS 테스트 통과!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+스틸 인코딩: 단일 인코딩과 청크 분할 인코딩의 프레임 일치 테스트 (네트워크 불필요, ffmpeg 필요)
+프레임 수와 장면 전환 위치가 frame_plan과 같은지 확인
+"""
+
+import subprocess
+import tempfile
+import numpy as np
+from video_engine import encode_stills, encode_chunked, encoder_profile, frame_plan, plan_chunks, ffmpeg_exe
+
+W, H = 160, 90
+DURATIONS = [1.234, 2.5, 0.01, 3.3, 4.1, 2.0, 2.328]  # 합계 15.472초, 0.01초 장면은 프레임 격자에서 빠짐
+
+def decode_levels(path):
+    """프레임별 밝기 (장면마다 다른 회색)"""
+    raw = subprocess.run([ffmpeg_exe(), "-v", "error", "-i", str(path), "-f", "rawvideo", "-pix_fmt", "gray", "-"],
+                         capture_output=True, check=True).stdout
+    return np.frombuffer(raw, np.uint8).reshape(-1, W * H).mean(axis=1).round()
+
+def test_plan():
+    """청크 계획의 프레임 합 = 단일 인코딩 프레임 수 = round(전체 길이 * fps)"""
+    print("🧮 프레임 계획 테스트 중...")
+    frames = frame_plan(DURATIONS, 30)
+    assert sum(n for _, n in frames) == round(sum(DURATIONS) * 30) == 464
+    for n in (1, 2, 3, 8):
+        chunks = plan_chunks(DURATIONS, 30, n)
+        assert [s for c in chunks for s in c] == frames and len(chunks) <= n
+    print(f"   ✅ {len(frames)}개 장면, {sum(n for _, n in frames)}프레임")
+
+def test_chunked_matches_single():
+    """단일/청크 인코딩 모두 464프레임, 장면 전환은 계획된 프레임에서"""
+    print("🎞️ 단일 vs 청크 인코딩 비교 중...")
+    profile = dict(encoder_profile("draft"), fps=30)
+    stills = [(np.full((H, W, 3), 20 * (i + 1), np.uint8), d) for i, d in enumerate(DURATIONS)]
+    audio = (np.zeros(int(sum(DURATIONS) * 24000), np.int16), 24000)
+    out = tempfile.mkdtemp()
+    single = decode_levels(encode_stills(stills, f"{out}/single.mp4", audio=audio, profile=profile))
+    chunked = decode_levels(encode_chunked(stills, f"{out}/chunked.mp4", audio=audio, profile=profile, workers=3))
+    expected = np.cumsum([n for _, n in frame_plan(DURATIONS, 30)])[:-1].tolist()
+    for levels in (single, chunked):
+        assert len(levels) == 464, len(levels)
+        assert (np.nonzero(np.diff(levels))[0] + 1).tolist() == expected
+    print(f"   ✅ 단일 {len(single)} / 청크 {len(chunked)}프레임, 전환 {expected}")
+
+def main():
+    print("🚀 청크 인코딩 테스트 시작")
+    print("=" * 50)
+    test_plan()
+    test_chunked_matches_single()
+    print("\n🎉 모든 청크 인코딩 테스트 통과!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import os
+from functools import lru_cache
+from typing import List, Optional
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+from config import VIDEO_FONT
+
+# Korean-capable fonts first; Latin-only ones only so that something renders
+FONT_PATHS = [
+    "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",
+    "/usr/share/fonts/truetype/nanum/NanumBarunGothic.ttf",
+    "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/truetype/noto/NotoSansCJK-Regular.ttc",
+    "/System/Library/Fonts/AppleSDGothicNeo.ttc",
+    "/System/Library/Fonts/AppleGothic.ttf",  # macOS
+    "C:/Windows/Fonts/malgun.ttf",  # Windows
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",
+]
+KOREAN_FONTS = 7  # entries of FONT_PATHS that cover Hangul
+
+@lru_cache(maxsize=None)
+def font_path() -> Optional[str]:
+    """First installed font, VIDEO_FONT taking precedence."""
+    candidates = ([VIDEO_FONT] if VIDEO_FONT else []) + FONT_PATHS
+    for path in candidates:
+        if os.path.exists(path):
+            if path in FONT_PATHS[KOREAN_FONTS:]:
+                print(f"⚠️ 한글 폰트를 찾을 수 없어 {os.path.basename(path)} 폰트를 사용합니다. (VIDEO_FONT로 지정 가능)")
+            return path
+    print("⚠️ 한글 폰트를 찾을 수 없어 기본 폰트를 사용합니다. (VIDEO_FONT로 지정 가능)")
+    return None
+
+@lru_cache(maxsize=None)
+def load_font(size: int, path: Optional[str]=None) -> ImageFont.FreeTypeFont:
+    path = path or font_path()
+    if path:
+        return ImageFont.truetype(path, size)
+    return ImageFont.load_default(size)
+
+def wrap_text(text: str, font: ImageFont.FreeTypeFont, width: int) -> List[str]:
+    """Greedy word wrap to a pixel width. Words wider than a line (long Korean runs without spaces,
+    URLs) are broken between characters. Explicit newlines are kept."""
+    lines = []
+    for paragraph in text.split("\n"):
+        line = ""
+        for word in paragraph.split():
+            trial = f"{line} {word}" if line else word
+            if font.getlength(trial) <= width:
+                line = trial
+                continue
+            if line:
+                lines.append(line)
+            line = ""
+            for ch in word:
+                if line and font.getlength(line + ch) > width:
+                    lines.append(line)
+                    line = ""
+                line += ch
+        lines.append(line)
+    return lines
+
+@lru_cache(maxsize=256)
+def render_text(text: str, size: int, width: int, color: str="white", align: str="left",
+                font: Optional[str]=None, line_spacing: float=1.25) -> np.ndarray:
+    """Text wrapped to `width` pixels as an RGBA uint8 array (width x text height), transparent
+    around the glyphs. Memoized per (text, size, width, color, align, font): the same title or
+    headline is drawn once however many outputs use it. Treat the result as read-only."""
+    f = load_font(size, font)
+    lines = wrap_text(text, f, width)
+    ascent, descent = f.getmetrics()
+    step = int(round(size * line_spacing))
+    height = max(1, step * (len(lines) - 1) + ascent + descent)
+    img = Image.new("RGBA", (width, height), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(img)
+    for i, line in enumerate(lines):
+        x = {"left": 0, "center": (width - f.getlength(line)) / 2, "right": width - f.getlength(line)}[align]
+        draw.text((x, i * step), line, font=f, fill=color)
+    layer = np.asarray(img)
+    layer.flags.writeable = False
+    return layer
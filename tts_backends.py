@@ -0,0 +1,122 @@
+import io, re, wave, zlib
+import numpy as np
+from typing import Dict, Protocol, Tuple
+from config import OPENAI_API_KEY, OPENAI_TTS_MODEL, OPENAI_TTS_VOICE, TTS_BACKEND
+from audio_utils import pcm_to_mp3
+
+class TTSBackend(Protocol):
+    """What the TTS stage needs from a speech engine. `formats` lists the response formats
+    synthesize_one can return ("pcm" is raw int16 mono at `sample_rate`); synthesize_segments
+    checks it before voicing anything. `streaming` says whether the engine sends audio while it is
+    generated (the OpenAI backend then reads the streaming response). `model`/`voice` key the
+    TTS cache. Batches of texts go through tts_openai.synthesize_segments, which adds
+    concurrency, retries and caching on top of synthesize_one."""
+    name: str
+    model: str
+    voice: str
+    formats: Tuple[str, ...]
+    streaming: bool
+    sample_rate: int
+
+    def synthesize_one(self, text: str, fmt: str="mp3") -> bytes: ...
+
+def _is_rejected(e: Exception) -> bool:
+    import openai
+    return isinstance(e, (openai.AuthenticationError, openai.PermissionDeniedError, openai.BadRequestError))
+
+class OpenAITTSBackend:
+    name = "openai"
+    formats = ("mp3", "pcm", "wav", "opus", "aac", "flac")
+    sample_rate = 24000
+
+    def __init__(self, model: str=OPENAI_TTS_MODEL, voice: str=OPENAI_TTS_VOICE, api_key: str=OPENAI_API_KEY,
+                 streaming: bool=True):
+        self.model, self.voice, self._api_key = model, voice, api_key
+        self.streaming = streaming  # False for proxies/mocks without the streaming endpoint
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            from openai import OpenAI
+            self._client = OpenAI(api_key=self._api_key)
+        return self._client
+
+    def synthesize_one(self, text: str, fmt: str="mp3") -> bytes:
+        if self.streaming:
+            try:
+                with self.client.audio.speech.with_streaming_response.create(
+                    model=self.model,
+                    voice=self.voice,
+                    input=text,
+                    response_format=fmt,
+                ) as resp:
+                    return b"".join(resp.iter_bytes())
+            except Exception as e:
+                # A rejected request (bad key, input too long) fails the same way without streaming
+                if _is_rejected(e):
+                    raise
+        # Fallback
+        audio = self.client.audio.speech.create(
+            model=self.model,
+            voice=self.voice,
+            input=text,
+            response_format=fmt,
+        )
+        b = audio.read() if hasattr(audio, "read") else audio
+        return b if isinstance(b, (bytes, bytearray)) else bytes(b)
+
+class OfflineTTSBackend:
+    """Deterministic stand-in for load and soak tests: a soft tone per text (or silence), as long as a
+    Korean newsreader would take to say it. Same text, same bytes; no network, no API spend."""
+    name = "offline"
+    model = "offline"
+    formats = ("pcm", "wav", "mp3")
+    streaming = False
+    sample_rate = 24000
+    SYLLABLES_PER_SECOND = 6.5
+    SENTENCE_PAUSE = 0.3
+
+    def __init__(self, voice: str="tone"):
+        self.voice = voice  # "tone" or "silence"
+
+    def duration_for(self, text: str) -> float:
+        syllables = len(re.sub(r"\s+", "", text))
+        sentences = len(re.findall(r"[.!?。…](\s|$)", text)) or 1
+        return max(0.5, syllables / self.SYLLABLES_PER_SECOND + sentences * self.SENTENCE_PAUSE)
+
+    def pcm(self, text: str) -> np.ndarray:
+        n = int(round(self.duration_for(text) * self.sample_rate))
+        if self.voice == "silence":
+            return np.zeros(n, dtype=np.int16)
+        freq = 180 + zlib.crc32(text.encode("utf-8")) % 220
+        t = np.arange(n) / self.sample_rate
+        fade = np.minimum(1.0, np.minimum(t, t[::-1]) / 0.02)
+        return (np.sin(2 * np.pi * freq * t) * fade * 3000).astype(np.int16)
+
+    def synthesize_one(self, text: str, fmt: str="mp3") -> bytes:
+        pcm = self.pcm(text)
+        if fmt == "pcm":
+            return pcm.astype("<i2").tobytes()
+        if fmt == "wav":
+            buf = io.BytesIO()
+            with wave.open(buf, "wb") as w:
+                w.setnchannels(1)
+                w.setsampwidth(2)
+                w.setframerate(self.sample_rate)
+                w.writeframes(pcm.astype("<i2").tobytes())
+            return buf.getvalue()
+        if fmt == "mp3":
+            return pcm_to_mp3(pcm, self.sample_rate)
+        raise ValueError(f"offline TTS backend does not produce {fmt!r}")
+
+_BACKENDS = {"openai": OpenAITTSBackend, "offline": OfflineTTSBackend}
+_instances: Dict[str, TTSBackend] = {}
+
+def get_backend(name: str=None) -> TTSBackend:
+    name = name or TTS_BACKEND
+    if name not in _BACKENDS:
+        raise ValueError(f"unknown TTS backend {name!r} (choose from {', '.join(_BACKENDS)})")
+    if name not in _instances:
+        _instances[name] = _BACKENDS[name]()
+    return _instances[name]
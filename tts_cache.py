@@ -0,0 +1,93 @@
+import os, re, shutil, hashlib, threading, unicodedata
+from pathlib import Path
+from typing import Dict, Optional
+from config import TTS_CACHE_DIR, TTS_CACHE_MAX_BYTES
+
+def normalize_text(text: str) -> str:
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFKC", text)).strip()
+
+def _place(src: Path, dst: Path):
+    # Hard link when both sides share a filesystem, copy otherwise; never write through an existing link.
+    dst.unlink(missing_ok=True)
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+class TTSCache:
+    """Content-addressed audio files keyed by (model, voice, normalised text, format), evicted oldest-first by size."""
+    def __init__(self, cache_dir: str, max_bytes: int):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = self.misses = self.bytes_saved = 0
+        self._lock = threading.Lock()
+
+    def path_for(self, model: str, voice: str, text: str, fmt: str="mp3") -> Path:
+        digest = hashlib.sha256("\0".join([model, voice, normalize_text(text), fmt]).encode("utf-8")).hexdigest()
+        return self.cache_dir / digest[:2] / f"{digest}.{fmt}"
+
+    def fetch(self, cached: Path, dest: Path) -> bool:
+        """Place a cached file at dest; False on a miss."""
+        try:
+            _place(cached, dest)
+            os.utime(cached)  # recency for eviction
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return False
+        with self._lock:
+            self.hits += 1
+            self.bytes_saved += cached.stat().st_size
+        return True
+
+    def load(self, cached: Path) -> Optional[bytes]:
+        """Cached bytes (for in-memory formats such as pcm), or None on a miss."""
+        try:
+            data = cached.read_bytes()
+            os.utime(cached)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+            self.bytes_saved += len(data)
+        return data
+
+    def save(self, data: bytes, cached: Path):
+        cached.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cached.with_name(f"{cached.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, cached)
+
+    def store(self, src: Path, cached: Path):
+        cached.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cached.with_name(f"{cached.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        _place(src, tmp)
+        os.replace(tmp, cached)
+
+    def evict(self) -> int:
+        """Delete least recently used files until the cache fits max_bytes; returns bytes freed."""
+        files = [(p.stat().st_mtime, p.stat().st_size, p) for p in self.cache_dir.glob("*/*") if p.suffix != ".tmp"]
+        total = sum(size for _, size, _ in files)
+        freed = 0
+        for _, size, p in sorted(files):
+            if total - freed <= self.max_bytes:
+                break
+            p.unlink(missing_ok=True)
+            freed += size
+        return freed
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "bytes_saved": self.bytes_saved,
+                "hit_rate": self.hits / lookups if lookups else 0.0}
+
+_cache = None
+
+def get_tts_cache() -> Optional[TTSCache]:
+    global _cache
+    if _cache is None and TTS_CACHE_DIR:
+        _cache = TTSCache(TTS_CACHE_DIR, TTS_CACHE_MAX_BYTES)
+    return _cache
@@ -1,53 +1,162 @@
-import io
+import re, time
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List
-from pydub import AudioSegment
-from openai import OpenAI
-from config import OPENAI_API_KEY, OPENAI_TTS_MODEL, OPENAI_TTS_VOICE
+from typing import List, Optional
+from config import (TTS_WORKERS, TTS_MAX_RETRIES, TTS_AUDIO_FORMAT, TTS_SENTENCE_CHUNKS,
+                    TTS_TRIM_SILENCE, TTS_SILENCE_DB)
+from tts_backends import TTSBackend, get_backend
+from tts_cache import TTSCache, get_tts_cache
+from audio_probe import audio_duration, probe_audio
+from audio_utils import concat_mp3_frames, concat_via_pcm, encode_pcm, trim_silence
+from utils import retry_call, is_retryable_openai
 
-client = OpenAI(api_key=OPENAI_API_KEY)
+SENTENCE_MIN_CHARS = 12  # shorter pieces ("1번 뉴스.") ride along with the next sentence
 
-def synthesize_segments(segments: List[str], out_dir: str) -> List[dict]:
-    """Given list of text segments, synthesize each to MP3 and return timing info."""
-    Path(out_dir).mkdir(parents=True, exist_ok=True)
-    results = []
-    for idx, text in enumerate(segments, start=1):
+def split_sentences(text: str, min_chars: int=SENTENCE_MIN_CHARS) -> List[str]:
+    """Split at Korean/Latin sentence ends (., !, ?, 。, …) followed by whitespace; merge very short pieces."""
+    out = []
+    for piece in re.split(r'(?<=[.!?。…])\s+', text.strip()):
+        if out and len(out[-1]) < min_chars:
+            out[-1] = f"{out[-1]} {piece}"
+        elif piece:
+            out.append(piece)
+    if len(out) > 1 and len(out[-1]) < min_chars:
+        last = out.pop()
+        out[-1] = f"{out[-1]} {last}"
+    return out or [text]
+
+def _request(backend: TTSBackend, idx: int, text: str, fmt: str) -> bytes:
+    return retry_call(lambda: backend.synthesize_one(text, fmt), TTS_MAX_RETRIES, 20.0, f"세그먼트 {idx} 음성 합성",
+                      is_retryable_openai)
+
+def _synthesize_pcm(backend: TTSBackend, idx: int, text: str, cache: Optional[TTSCache]) -> dict:
+    start = time.perf_counter()
+    cached = cache.path_for(backend.model, backend.voice, text, "pcm") if cache else None
+    data = cache.load(cached) if cached else None
+    hit = data is not None
+    if not hit:
+        data = _request(backend, idx, text, "pcm")
+        if cached:
+            cache.save(data, cached)
+    pcm = np.frombuffer(data, dtype="<i2")
+    return {"file": None, "pcm": pcm, "sample_rate": backend.sample_rate, "duration": len(pcm) / backend.sample_rate,
+            "text": text, "latency": time.perf_counter() - start, "cached": hit}
+
+def _synthesize_one(backend: TTSBackend, idx: int, text: str, out_dir: str, cache: Optional[TTSCache]) -> dict:
+    filename = Path(out_dir) / f"seg_{idx:02d}.mp3"
+    start = time.perf_counter()
+    cached = cache.path_for(backend.model, backend.voice, text) if cache else None
+    if cached and cache.fetch(cached, filename):
+        return {"file": str(filename), "duration": audio_duration(filename), "text": text,
+                "latency": time.perf_counter() - start, "cached": True}
+    data = _request(backend, idx, text, "mp3")
+    filename.unlink(missing_ok=True)  # may be a hard link into the cache
+    filename.write_bytes(data)
+    if cached:
+        cache.store(filename, cached)
+    latency = time.perf_counter() - start
+    return {"file": str(filename), "duration": audio_duration(filename), "text": text, "latency": latency, "cached": False}
+
+def _trim(part: dict) -> dict:
+    """Cut leading/trailing silence from a PCM part; sentence offsets follow the new start."""
+    pcm, rate = part["pcm"], part["sample_rate"]
+    start, end = trim_silence(pcm, rate, TTS_SILENCE_DB)
+    if (start, end) == (0, len(pcm)):
+        return part
+    part.update({"pcm": pcm[start:end], "duration": (end - start) / rate,
+                 "trimmed": (len(pcm) - (end - start)) / rate})
+    for s in part.get("sentences", ()):
+        s["start"] = min(max(0.0, s["start"] - start / rate), part["duration"])
+        s["end"] = min(max(0.0, s["end"] - start / rate), part["duration"])
+    return part
+
+def _stitch(idx: int, text: str, pieces: List[dict], out_dir: str, fmt: str, trim: bool) -> dict:
+    """Join sentence chunks sample-exactly and record where each sentence starts and ends."""
+    pcm = np.concatenate([p["pcm"] for p in pieces])
+    rate = pieces[0]["sample_rate"]
+    sentences, pos = [], 0
+    for p in pieces:
+        sentences.append({"start": pos / rate, "end": (pos + len(p["pcm"])) / rate, "text": p["text"]})
+        pos += len(p["pcm"])
+    part = {"file": None, "pcm": pcm, "sample_rate": rate, "duration": len(pcm) / rate,
+            "text": text, "latency": max(p["latency"] for p in pieces),
+            "cached": all(p["cached"] for p in pieces), "sentences": sentences}
+    if trim:
+        _trim(part)
+    if fmt != "pcm":
         filename = Path(out_dir) / f"seg_{idx:02d}.mp3"
-        success = False
-        try:
-            # Streaming (if supported)
-            with client.audio.speech.with_streaming_response.create(
-                model=OPENAI_TTS_MODEL,
-                voice=OPENAI_TTS_VOICE,
-                input=text
-            ) as resp:
-                resp.stream_to_file(filename)
-                success = True
-        except Exception:
-            pass
-        if not success:
-            # Fallback
-            audio = client.audio.speech.create(
-                model=OPENAI_TTS_MODEL,
-                voice=OPENAI_TTS_VOICE,
-                input=text,
-                format="mp3",
-            )
-            # Try to_file, else read bytes
-            try:
-                audio.to_file(filename)
-            except Exception:
-                b = audio.read() if hasattr(audio, "read") else audio
-                with open(filename, "wb") as f:
-                    f.write(b if isinstance(b, (bytes, bytearray)) else bytes(b))
-        seg = AudioSegment.from_file(filename)
-        results.append({"file": str(filename), "duration": seg.duration_seconds, "text": text})
+        filename.unlink(missing_ok=True)
+        encode_pcm(part["pcm"], rate, filename)  # trimmed, if trim
+        part.update({"file": str(filename), "duration": audio_duration(filename)})
+        del part["pcm"], part["sample_rate"]
+    return part
+
+def synthesize_segments(segments: List[str], out_dir: str, workers: Optional[int]=None,
+                        use_cache: bool=True, fmt: Optional[str]=None,
+                        sentence_chunks: Optional[bool]=None, backend: Optional[TTSBackend]=None,
+                        trim: Optional[bool]=None) -> List[dict]:
+    """Given list of text segments, synthesize each to MP3 and return timing info.
+    Segments are voiced concurrently (at most `workers` at once); results keep segment order.
+    Segments already voiced with the same model/voice/text are linked from the TTS cache.
+    With fmt="pcm" nothing is written: each part carries 'pcm' (int16 array) and 'sample_rate'
+    instead of 'file', ready for audio_utils.assemble_pcm.
+    With sentence_chunks, every sentence is its own parallel PCM request; chunks are stitched back
+    per segment and each part gains 'sentences' ([{start, end, text}] relative to the segment).
+    `backend` defaults to the one named by TTS_BACKEND (see tts_backends).
+    With trim, leading/trailing silence is cut from every PCM-backed segment (pcm mode or sentence
+    chunks) so the gaps added at assembly are the only pauses; 'trimmed' records the seconds removed."""
+    Path(out_dir).mkdir(parents=True, exist_ok=True)
+    workers = TTS_WORKERS if workers is None else workers
+    fmt = TTS_AUDIO_FORMAT if fmt is None else fmt
+    sentence_chunks = TTS_SENTENCE_CHUNKS if sentence_chunks is None else sentence_chunks
+    trim = TTS_TRIM_SILENCE if trim is None else trim
+    backend = backend or get_backend()
+    # Sentence chunks are requested as PCM and stitched, whatever the output format
+    need = "pcm" if sentence_chunks or fmt == "pcm" else "mp3"
+    if need not in backend.formats:
+        raise ValueError(f"TTS backend {backend.name!r} cannot produce {need!r} "
+                         f"(supports {', '.join(backend.formats)}); check TTS_AUDIO_FORMAT/TTS_SENTENCE_CHUNKS")
+    cache = get_tts_cache() if use_cache else None
+    if sentence_chunks:
+        chunks = [split_sentences(text) for text in segments]
+        jobs = [(idx, s) for idx, sents in enumerate(chunks, start=1) for s in sents]
+        job = lambda j: _synthesize_pcm(backend, j[0], j[1], cache)
+    elif fmt == "pcm":
+        jobs = list(enumerate(segments, start=1))
+        job = lambda j: _synthesize_pcm(backend, j[0], j[1], cache)
+    else:
+        jobs = list(enumerate(segments, start=1))
+        job = lambda j: _synthesize_one(backend, j[0], j[1], out_dir, cache)
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(jobs) or 1))) as pool:
+        results = list(pool.map(job, jobs))
+    if sentence_chunks:
+        pieces, results = iter(results), []
+        for idx, (text, sents) in enumerate(zip(segments, chunks), start=1):
+            results.append(_stitch(idx, text, [next(pieces) for _ in sents], out_dir, fmt, trim))
+    elif fmt == "pcm" and trim:
+        results = [_trim(r) for r in results]
+    for idx, r in enumerate(results, start=1):
+        origin = "캐시" if r["cached"] else f"{r['latency']:.2f}s"
+        print(f"   🎤 seg_{idx:02d}: {origin} (음성 {r['duration']:.1f}s)")
+    if cache:
+        cache.evict()
+        st = cache.stats()
+        print(f"💾 TTS 캐시: 적중률 {st['hit_rate']:.0%} ({st['hits']}/{st['hits'] + st['misses']}), "
+              f"{st['bytes_saved'] / 1024:.0f} KB 재사용")
     return results
 
-def concat_audio(parts: List[dict], outfile: str) -> float:
-    audio = AudioSegment.silent(duration=500)  # lead-in
-    for p in parts:
-        audio += AudioSegment.from_file(p["file"])
-        audio += AudioSegment.silent(duration=250)
-    audio.export(outfile, format="mp3")
-    return len(audio) / 1000.0
+def concat_audio(parts: List[dict], outfile: str, lead_in: float=0.5, gap: float=0.25) -> float:
+    """Join segments with a lead-in and a gap after each; returns the narration length in seconds
+    and sets each part's 'start' (its offset in the narration).
+    Matching MP3 segments are joined frame by frame without re-encoding; anything else is streamed
+    through ffmpeg as PCM. Either way only one segment is held in memory at a time."""
+    files = [p["file"] for p in parts]
+    try:
+        total, starts = concat_mp3_frames(files, outfile, lead_in, gap)
+    except ValueError:
+        info = probe_audio(files[0])
+        total, starts = concat_via_pcm(files, outfile, lead_in, gap, info.sample_rate, info.channels)
+    for p, start in zip(parts, starts):
+        p["start"] = start
+    return total
@@ -1,10 +1,8 @@
 import io
 from pathlib import Path
 from typing import List
-from openai import OpenAI
-from config import OPENAI_API_KEY, OPENAI_TTS_MODEL, OPENAI_TTS_VOICE
-
-client = OpenAI(api_key=OPENAI_API_KEY)
+from audio_probe import audio_duration
+from tts_backends import get_backend
 
 def synthesize_segments(segments: List[str], out_dir: str) -> List[dict]:
     """Given list of text segments, synthesize each to MP3 and return timing info."""
@@ -16,16 +14,12 @@ def synthesize_segments(segments: List[str], out_dir: str) -> List[dict]:
         success = False
         
         try:
-            # OpenAI TTS API 호출
-            audio = client.audio.speech.create(
-                model=OPENAI_TTS_MODEL,
-                voice=OPENAI_TTS_VOICE,
-                input=text
-            )
+            # TTS 백엔드 호출 (TTS_BACKEND: openai / offline)
+            audio = get_backend().synthesize_one(text, "mp3")
             
             # 파일로 저장
             with open(filename, "wb") as f:
-                f.write(audio.content)
+                f.write(audio)
             
             success = True
             print(f"   ✅ 세그먼트 {idx} 생성 완료: {filename}")
@@ -36,8 +30,11 @@ def synthesize_segments(segments: List[str], out_dir: str) -> List[dict]:
             with open(filename, "wb") as f:
                 f.write(b"dummy_audio_content")
         
-        # 더미 duration 정보 (실제로는 pydub로 측정해야 함)
-        duration = len(text.split()) * 0.5  # 단어 수 * 0.5초 (대략적)
+        # MP3 프레임 헤더에서 실제 길이 측정 (디코딩 없음)
+        try:
+            duration = audio_duration(filename)
+        except ValueError:
+            duration = len(text.split()) * 0.5  # 더미 파일: 단어 수 * 0.5초 (대략적)
         
         results.append({
             "file": str(filename), 
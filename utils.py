@@ -1,5 +1,10 @@
-import re, urllib.parse, os
+import re, urllib.parse, os, hashlib, unicodedata, random, time, asyncio
 from datetime import datetime, timezone
+from typing import Awaitable, Callable, TypeVar
+
+T = TypeVar("T")
+
+_TRACKING_PARAMS = re.compile(r'^(utm_\w+|fbclid|gclid|ref|cmpid|from)$', re.I)
 
 def clean_google_news_link(url: str) -> str:
     # Extract real URL from Google News RSS links that are often wrapped with 'url=' parameter.
@@ -17,9 +22,64 @@ def clean_google_news_link(url: str) -> str:
     except Exception:
         return url
 
+def canonical_link(url: str) -> str:
+    # Same article, different wrappers: lowercase host, drop fragment, tracking params and trailing slash.
+    try:
+        parsed = urllib.parse.urlparse(clean_google_news_link(url).strip())
+        query = [(k, v) for k, v in urllib.parse.parse_qsl(parsed.query, keep_blank_values=True)
+                 if not _TRACKING_PARAMS.match(k)]
+        path = parsed.path.rstrip("/") or "/"
+        return urllib.parse.urlunparse((parsed.scheme.lower(), parsed.netloc.lower(), path, "",
+                                        urllib.parse.urlencode(sorted(query)), ""))
+    except Exception:
+        return url
+
+def title_hash(title: str) -> str:
+    # Google News titles end with " - 매체명"; drop it so the same headline from a re-post matches.
+    t = re.sub(r'\s+-\s+[^-]+$', '', title or "")
+    t = re.sub(r'[\W_]+', '', unicodedata.normalize("NFKC", t).lower())
+    return hashlib.sha1(t.encode("utf-8")).hexdigest()[:16]
+
 def ensure_dir(path: str):
     os.makedirs(path, exist_ok=True)
 
 def timestamp_ko(dt: datetime) -> str:
     dt = dt.astimezone(timezone.utc).astimezone()  # local tz
     return dt.strftime("%Y-%m-%d %H:%M")
+
+def backoff_delay(attempt: int, cap: float) -> float:
+    # Full-jitter exponential backoff: anywhere in [0, min(cap, 2^attempt)] seconds.
+    return random.uniform(0.0, min(cap, 2.0 ** attempt))
+
+def is_retryable_openai(e: Exception) -> bool:
+    # Rate limits, timeouts, dropped connections and 5xx are worth another try; 4xx and local errors are not.
+    import openai
+    if isinstance(e, (openai.RateLimitError, openai.APITimeoutError, openai.APIConnectionError)):
+        return True
+    return isinstance(e, openai.APIStatusError) and e.status_code >= 500
+
+def retry_call(fn: Callable[[], T], retries: int, cap: float, label: str,
+               retryable: Callable[[Exception], bool]=lambda e: True) -> T:
+    """Call fn, retrying up to `retries` times on retryable errors with full-jitter backoff."""
+    for attempt in range(retries + 1):
+        try:
+            return fn()
+        except Exception as e:
+            if attempt >= retries or not retryable(e):
+                raise
+            delay = backoff_delay(attempt, cap)
+            print(f"⚠️ {label} 재시도 {attempt + 1}/{retries} ({delay:.1f}s 후): {e}")
+            time.sleep(delay)
+
+async def aretry_call(fn: Callable[[], Awaitable[T]], retries: int, cap: float, label: str,
+                      retryable: Callable[[Exception], bool]=lambda e: True) -> T:
+    """Async retry_call: fn returns a fresh awaitable per attempt."""
+    for attempt in range(retries + 1):
+        try:
+            return await fn()
+        except Exception as e:
+            if attempt >= retries or not retryable(e):
+                raise
+            delay = backoff_delay(attempt, cap)
+            print(f"⚠️ {label} 재시도 {attempt + 1}/{retries} ({delay:.1f}s 후): {e}")
+            await asyncio.sleep(delay)
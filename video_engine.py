@@ -0,0 +1,273 @@
+import os, multiprocessing, subprocess, tempfile, wave
+from concurrent.futures import Executor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional, Tuple, Union
+import numpy as np
+from PIL import Image
+from audio_utils import ffmpeg_exe
+from config import ENCODER_PROFILE, ENCODER_PROFILES, ENCODER_CHUNK_WORKERS, ENCODER_CHUNK_RETRIES
+
+Audio = Union[str, Tuple[np.ndarray, int], None]
+
+def still_states(events: List[Tuple[float, float, object]], duration: float, fps: int=30) -> List[Tuple[float, float, tuple]]:
+    """Split [0, duration) into intervals over which the set of visible layers does not change.
+    `events` are (start, end, layer key); returns (start, end, keys in event order) with boundaries
+    snapped to the frame grid, adjacent identical states merged and zero-length ones dropped."""
+    snap = lambda t: round(min(max(t, 0.0), duration) * fps) / fps
+    cuts = sorted({0.0, snap(duration)} | {snap(t) for s, e, _ in events for t in (s, e)})
+    states = []
+    for a, b in zip(cuts, cuts[1:]):
+        if b <= a:
+            continue
+        keys = tuple(k for s, e, k in events if snap(s) <= a and snap(e) >= b)
+        if states and states[-1][2] == keys:
+            states[-1] = (states[-1][0], b, keys)
+        else:
+            states.append((a, b, keys))
+    return states
+
+def encoder_profile(name: Optional[str]=None) -> dict:
+    """Named encoder settings from config.ENCODER_PROFILES (ENCODER_PROFILE by default), with its name."""
+    name = name or ENCODER_PROFILE
+    if name not in ENCODER_PROFILES:
+        raise ValueError(f"unknown encoder profile {name!r} (choose from {', '.join(ENCODER_PROFILES)})")
+    return dict(ENCODER_PROFILES[name], name=name)
+
+def x264_args(profile: dict, keyframes: Iterable[float]=()) -> List[str]:
+    """libx264 output options for a profile; `keyframes` (seconds) get forced IDR frames."""
+    args = ["-c:v", "libx264", "-preset", profile["preset"], "-crf", str(profile["crf"]),
+            "-g", str(max(1, int(profile["keyint"] * profile["fps"]))), "-pix_fmt", "yuv420p",
+            "-threads", str(profile["threads"])]
+    if profile.get("tune"):
+        args += ["-tune", profile["tune"]]
+    times = sorted({round(t, 3) for t in keyframes if t > 0})
+    if times:
+        args += ["-force_key_frames", ",".join(f"{t:.3f}" for t in times)]
+    return args
+
+def report_encode(path: str, profile: dict, seconds: float, extra: str=""):
+    size = os.path.getsize(path) / (1024 * 1024)
+    print(f"🎬 {Path(path).name} [{profile['name']}]: {extra}인코딩 {seconds:.1f}초, {size:.1f}MB")
+
+def _write_audio(audio: Audio, tmp: Path) -> str:
+    if isinstance(audio, tuple):
+        samples, sample_rate = audio
+        path = tmp / "audio.wav"
+        with wave.open(str(path), "wb") as w:
+            w.setnchannels(1)
+            w.setsampwidth(2)
+            w.setframerate(sample_rate)
+            w.writeframes(samples.astype(np.int16).tobytes())
+        return str(path)
+    return str(audio)
+
+# Narration codecs: ffmpeg encoder and a container every output can stream-copy from
+AUDIO_CODECS = {"aac": ("aac", ".m4a"), "opus": ("libopus", ".opus")}
+
+def is_encoded(audio: Audio) -> bool:
+    """True for narration already encoded for muxing (see encode_audio), which is stream-copied."""
+    return isinstance(audio, (str, Path)) and Path(audio).suffix in {ext for _, ext in AUDIO_CODECS.values()}
+
+def encode_audio(audio: Audio, out_path: str, codec: str="aac", bitrate: str="128k") -> str:
+    """Encode narration (file path or in-memory int16 (samples, sample_rate)) once into an
+    elementary stream that any number of videos can stream-copy."""
+    cmd = [ffmpeg_exe(), "-hide_banner", "-loglevel", "error", "-y"]
+    if isinstance(audio, tuple):
+        samples, sample_rate = audio
+        cmd += ["-f", "s16le", "-ar", str(sample_rate), "-ac", "1", "-i", "pipe:0"]
+        data = samples.astype(np.int16).tobytes()
+    else:
+        cmd += ["-i", str(audio)]
+        data = None
+    cmd += ["-vn", "-c:a", AUDIO_CODECS[codec][0], "-b:a", bitrate, str(out_path)]
+    subprocess.run(cmd, input=data, check=True)
+    return str(out_path)
+
+def edition_audio(audio_path: str, codec: str="aac") -> str:
+    """The encoded sibling of a narration file (narration.mp3 -> narration.m4a), encoded only when
+    missing or older than the source, so every video of an edition shares one audio encode."""
+    src = Path(audio_path)
+    dst = src.with_suffix(AUDIO_CODECS[codec][1])
+    if not dst.exists() or dst.stat().st_mtime < src.stat().st_mtime:
+        encode_audio(str(src), str(dst), codec)
+    return str(dst)
+
+def mux_audio(video_path: str, audio_file: str, out_path: str, duration: float, loop_audio: bool=False):
+    """Attach an encoded narration to a video by stream copy, cut (or looped) to `duration` seconds."""
+    cmd = [ffmpeg_exe(), "-hide_banner", "-loglevel", "error", "-y", "-i", str(video_path)]
+    cmd += (["-stream_loop", "-1"] if loop_audio else []) + ["-i", str(audio_file)]
+    cmd += ["-map", "0:v", "-map", "1:a", "-c", "copy", "-t", f"{duration:.6f}", "-movflags", "+faststart", str(out_path)]
+    subprocess.run(cmd, check=True)
+
+def _write_stills(stills: List[Tuple[Union[Image.Image, np.ndarray], float]], tmp: Path) -> List[Tuple[str, float]]:
+    entries, cache = [], {}
+    for i, (img, seconds) in enumerate(stills):
+        # The same image object held twice is written once
+        if id(img) not in cache:
+            cache[id(img)] = str(tmp / f"still_{i:04d}.png")
+            (img if isinstance(img, Image.Image) else Image.fromarray(img)).convert("RGB").save(cache[id(img)], compress_level=1)
+        entries.append((cache[id(img)], seconds))
+    return entries
+
+def _concat_list(entries: List[Tuple[str, float]], path: Path) -> str:
+    lines = []
+    for file, seconds in entries:
+        lines += [f"file '{file}'", f"duration {seconds:.6f}"]
+    # The demuxer ignores the last entry's duration unless the file is listed once more
+    lines.append(lines[-2])
+    path.write_text("\n".join(lines) + "\n")
+    return str(path)
+
+def _audio_args(audio: Audio, tmp: Path, loop_audio: bool) -> Tuple[List[str], List[str]]:
+    """ffmpeg input and output options for the narration as input #1."""
+    if audio is None:
+        return [], []
+    inputs = (["-stream_loop", "-1"] if loop_audio else []) + ["-i", _write_audio(audio, tmp)]
+    return inputs, ["-map", "1:a"] + (["-c:a", "copy"] if is_encoded(audio) else ["-c:a", "aac", "-b:a", "128k"])
+
+def encode_stills(stills: List[Tuple[Union[Image.Image, np.ndarray], float]], out_path: str, audio: Audio=None,
+                  fps: Optional[int]=None, profile: Optional[dict]=None, loop_audio: bool=False) -> str:
+    """Encode a slideshow of held frames: each (image, seconds) is written once as PNG and held by
+    ffmpeg's concat demuxer, so no per-frame Python work remains. `audio` is a file path or in-memory
+    int16 (samples, sample_rate); it is cut to the video length, or looped to fill it with loop_audio.
+    Already-encoded narration (see encode_audio) is stream-copied rather than re-encoded.
+    Video settings come from `profile` (see encoder_profile), `fps` overriding its frame rate;
+    stills are snapped to the frame grid (see frame_plan) and every still starts on a keyframe."""
+    profile = dict(profile or encoder_profile(), **({"fps": fps} if fps else {}))
+    total = sum(d for _, d in stills)
+    frames = frame_plan([d for _, d in stills], profile["fps"])
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        pngs = _write_stills(stills, tmp)
+        audio_in, audio_out = _audio_args(audio, tmp, loop_audio)
+        video_in, video_out = _frames_args([(pngs[i][0], n) for i, n in frames], tmp / "stills.txt", profile)
+        cmd = [ffmpeg_exe(), "-hide_banner", "-loglevel", "error", "-y"] + video_in + audio_in
+        cmd += video_out + audio_out + ["-t", f"{total:.6f}", "-movflags", "+faststart", str(out_path)]
+        subprocess.run(cmd, check=True)
+    return str(out_path)
+
+def frame_plan(durations: List[float], fps: int) -> List[Tuple[int, int]]:
+    """(still index, frame count) on the output frame grid: still boundaries are rounded to the
+    nearest frame, so stills shorter than half a frame drop out and the frame counts add up to
+    round(total * fps). Single and chunked encodes both follow this plan."""
+    bounds = np.rint(np.cumsum([0.0] + list(durations)) * fps).astype(int)
+    return [(i, int(b - a)) for i, (a, b) in enumerate(zip(bounds, bounds[1:])) if b > a]
+
+def _frames_args(entries: List[Tuple[str, int]], list_path: Path, profile: dict) -> Tuple[List[str], List[str]]:
+    """ffmpeg input and output options encoding (png, frame count) entries as exactly that many
+    constant-rate frames with a keyframe at each still; the video stream is input #0."""
+    fps = profile["fps"]
+    starts = np.cumsum([0] + [n for _, n in entries[:-1]]) / fps
+    inputs = ["-f", "concat", "-safe", "0", "-i", _concat_list([(f, n / fps) for f, n in entries], list_path)]
+    outputs = ["-map", "0:v", "-vf", f"fps={fps}:round=near", "-fps_mode", "cfr"] + x264_args(profile, starts)
+    return inputs, outputs + ["-frames:v", str(sum(n for _, n in entries))]
+
+def plan_chunks(durations: List[float], fps: int, n: int) -> List[List[Tuple[int, int]]]:
+    """Group consecutive stills into at most `n` chunks of roughly equal length, cutting only between
+    stills. Boundaries are snapped to the frame grid, so each still becomes (index, frame count) and
+    the chunks add up to exactly the frames a single encode would produce (see frame_plan)."""
+    frames = frame_plan(durations, fps)
+    target = sum(f for _, f in frames) / max(1, n)
+    chunks, current, filled = [], [], 0
+    for still in frames:
+        current.append(still)
+        filled += still[1]
+        if filled >= target * (len(chunks) + 1) and len(chunks) < n - 1:
+            chunks.append(current)
+            current = []
+    if current:
+        chunks.append(current)
+    return chunks
+
+def _encode_chunk(entries: List[Tuple[str, int]], out_path: str, profile: dict) -> str:
+    """Video-only encode of (png, frame count) entries; runs in a worker process."""
+    video_in, video_out = _frames_args(entries, Path(out_path).with_suffix(".txt"), profile)
+    cmd = [ffmpeg_exe(), "-hide_banner", "-loglevel", "error", "-y"] + video_in + video_out + [str(out_path)]
+    subprocess.run(cmd, check=True, capture_output=True)
+    return str(out_path)
+
+def chunk_workers() -> int:
+    return ENCODER_CHUNK_WORKERS or os.cpu_count() or 1
+
+def chunk_pool(workers: Optional[int]=None) -> ProcessPoolExecutor:
+    # spawn, not fork: callers may already be running encoder threads. Spawned workers re-import
+    # __main__, so the calling script needs an `if __name__ == "__main__":` guard
+    return ProcessPoolExecutor(max_workers=workers or chunk_workers(), mp_context=multiprocessing.get_context("spawn"))
+
+def encode_chunked(stills: List[Tuple[Union[Image.Image, np.ndarray], float]], out_path: str, audio: Audio=None,
+                   profile: Optional[dict]=None, pool: Optional[Executor]=None, workers: Optional[int]=None,
+                   retries: Optional[int]=None) -> str:
+    """encode_stills split across processes: the stills are cut into chunks at still boundaries,
+    each chunk is encoded independently (retried on its own if it fails), and the chunks are joined
+    by stream copy with the narration muxed in. Frame counts follow the same frame grid as a single
+    encode, so timing and A/V sync are unchanged. `pool` lets several outputs share one process pool."""
+    profile = profile or encoder_profile()
+    workers = workers or chunk_workers()
+    retries = ENCODER_CHUNK_RETRIES if retries is None else retries
+    chunks = plan_chunks([d for _, d in stills], profile["fps"], workers)
+    if len(chunks) < 2:
+        return encode_stills(stills, out_path, audio=audio, profile=profile)
+    if not profile["threads"]:
+        # Split the cores between chunks instead of every x264 instance claiming all of them
+        profile = dict(profile, threads=max(1, (os.cpu_count() or 1) // min(workers, len(chunks))))
+    total = sum(d for _, d in stills)
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        pngs = _write_stills(stills, tmp)
+        jobs = [([(pngs[i][0], n) for i, n in chunk], str(tmp / f"chunk_{c:03d}.mp4"), profile)
+                for c, chunk in enumerate(chunks)]
+        own_pool = pool is None
+        pool = pool or chunk_pool(workers)
+        try:
+            attempts = [0] * len(jobs)
+            pending = {pool.submit(_encode_chunk, *job): c for c, job in enumerate(jobs)}
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    c = pending.pop(future)
+                    try:
+                        future.result()
+                    except Exception as e:
+                        attempts[c] += 1
+                        if attempts[c] > retries:
+                            raise
+                        print(f"⚠️ 청크 {c+1}/{len(jobs)} 인코딩 실패, 재시도 {attempts[c]}/{retries}: {e}")
+                        pending[pool.submit(_encode_chunk, *jobs[c])] = c
+        finally:
+            if own_pool:
+                pool.shutdown()
+
+        (tmp / "chunks.txt").write_text("".join(f"file '{path}'\n" for _, path, _ in jobs))
+        audio_in, audio_out = _audio_args(audio, tmp, False)
+        cmd = [ffmpeg_exe(), "-hide_banner", "-loglevel", "error", "-y",
+               "-f", "concat", "-safe", "0", "-i", str(tmp / "chunks.txt")] + audio_in
+        cmd += ["-map", "0:v", "-c:v", "copy"] + audio_out
+        cmd += ["-t", f"{total:.6f}", "-movflags", "+faststart", str(out_path)]
+        subprocess.run(cmd, check=True)
+    return str(out_path)
+
+def render_states(states: List[Tuple[float, float, tuple]],
+                  rasterize: Callable[[Tuple[float, float, tuple]], np.ndarray]) -> List[Tuple[np.ndarray, float]]:
+    """One rasterized frame per distinct layer set; a set that reappears reuses its frame."""
+    frames, stills = {}, []
+    for start, end, keys in states:
+        if keys not in frames:
+            frames[keys] = rasterize((start, end, keys))
+        stills.append((frames[keys], end - start))
+    return stills
+
+def composite(background: np.ndarray, layers: List[dict]) -> np.ndarray:
+    """Alpha-blend RGBA layers ({"image", "pos"}) over an RGB background, in order, clipped to the frame."""
+    frame = background.copy()
+    H, W = frame.shape[:2]
+    for layer in layers:
+        img, (x, y) = layer["image"], layer["pos"]
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + img.shape[1], W), min(y + img.shape[0], H)
+        if x1 <= x0 or y1 <= y0:
+            continue
+        src = img[y0 - y:y1 - y, x0 - x:x1 - x].astype(np.float32)
+        alpha = src[..., 3:] / 255.0
+        dst = frame[y0:y1, x0:x1].astype(np.float32)
+        frame[y0:y1, x0:x1] = (src[..., :3] * alpha + dst * (1.0 - alpha) + 0.5).astype(np.uint8)
+    return frame
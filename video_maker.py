@@ -1,36 +1,55 @@
-from moviepy.editor import (AudioFileClip, ImageClip, TextClip, CompositeVideoClip, ColorClip)
-from typing import List, Dict, Tuple
+from moviepy.editor import (ImageClip, CompositeVideoClip)
+from typing import List, Optional, Tuple, Union
 from pathlib import Path
-import srt, datetime
-import PIL
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+import srt, datetime, tempfile, time
+from PIL import Image
 import numpy as np
+from config import VIDEO_ENGINE, NARRATION_CODEC
+from video_engine import (still_states, render_states, encode_stills, encode_chunked, chunk_pool, chunk_workers,
+                          encode_audio, is_encoded, mux_audio, composite, encoder_profile, x264_args, report_encode,
+                          AUDIO_CODECS)
+from text_render import render_text
 
 def parse_resolution(res: str) -> Tuple[int,int]:
     w,h = res.split("x")
     return int(w), int(h)
 
-def create_news_background(W: int, H: int, duration: float):
-    """일반적인 뉴스 스타일의 배경 생성"""
-    # 단순한 그라데이션 배경 (ColorClip 사용)
-    # 어두운 회색에서 검은색으로 그라데이션 효과를 위해 여러 레이어 사용
-    
+def news_background(W: int, H: int) -> np.ndarray:
+    """일반적인 뉴스 스타일의 배경 (RGB 배열)"""
     # 기본 배경 (어두운 회색)
-    bg_base = ColorClip(size=(W, H), color=(30, 30, 30)).set_duration(duration)
-    
+    bg = np.full((H, W, 3), 30, dtype=np.uint8)
     # 상단 바 (뉴스 채널 스타일)
-    top_bar = ColorClip(size=(W, int(H * 0.06)), color=(50, 50, 50)).set_duration(duration)
-    top_bar = top_bar.set_position((0, 0))
-    
+    bg[:int(H * 0.06)] = 50
     # 좌측 세로 바
-    left_bar = ColorClip(size=(int(W * 0.01), H), color=(70, 70, 70)).set_duration(duration)
-    left_bar = left_bar.set_position((0, 0))
-    
+    bg[:, :int(W * 0.01)] = 70
     # 하단 바 (자막 영역)
-    bottom_bar = ColorClip(size=(W, int(H * 0.15)), color=(20, 20, 20)).set_duration(duration)
-    bottom_bar = bottom_bar.set_position((0, H - int(H * 0.15)))
-    
-    # 모든 레이어 합성
-    return CompositeVideoClip([bg_base, top_bar, left_bar, bottom_bar])
+    bg[H - int(H * 0.15):] = 20
+    return bg
+
+@lru_cache(maxsize=4)
+def _background_source(background_image: str) -> Optional[Image.Image]:
+    # Decoded once per run however many outputs are rendered
+    try:
+        with Image.open(background_image) as img:
+            src = img.convert("RGB")
+        print(f"✅ 배경 이미지 사용: {background_image}")
+        return src
+    except Exception as e:
+        print(f"⚠️ 배경 이미지 로드 실패, 뉴스 스타일 배경 사용: {e}")
+        return None
+
+def background_frame(background_image: str, W: int, H: int) -> np.ndarray:
+    # 배경 이미지 사용 시도
+    if background_image and Path(background_image).exists():
+        src = _background_source(str(background_image))
+        if src is not None:
+            return np.asarray(src.resize((W, H), Image.LANCZOS))
+    else:
+        print("🎨 뉴스 스타일 배경 생성 중...")
+    # 뉴스 스타일 배경 사용
+    return news_background(W, H)
 
 def build_srt(segments: List[dict], srt_path: str):
     subs = []
@@ -41,52 +60,96 @@ def build_srt(segments: List[dict], srt_path: str):
     with open(srt_path, "w", encoding="utf-8") as f:
         f.write(srt.compose(subs))
 
-def make_video(audio_path: str, timeline: List[dict], background_image: str, resolution: str, title: str, out_path: str, mode: str="landscape"):
-    W,H = parse_resolution(resolution)
-    
-    # 배경 이미지 사용 시도
-    if background_image and Path(background_image).exists():
-        try:
-            # PIL 호환성을 위한 resize 설정
-            bg = ImageClip(background_image).resize(newsize=(W,H)).set_duration(timeline[-1]["end"] + 1.0)
-            print(f"✅ 배경 이미지 사용: {background_image}")
-        except Exception as e:
-            print(f"⚠️ 배경 이미지 로드 실패, 뉴스 스타일 배경 사용: {e}")
-            # 뉴스 스타일 배경 사용
-            bg = create_news_background(W, H, timeline[-1]["end"] + 1.0)
-    else:
-        # 뉴스 스타일 배경 사용
-        print("🎨 뉴스 스타일 배경 생성 중...")
-        bg = create_news_background(W, H, timeline[-1]["end"] + 1.0)
-
-    # Title with shadow effect
-    title_clip = TextClip(txt=title, fontsize=64 if mode=="shorts" else 54, color="white", 
-                         method="caption", size=(W-120, None), align="West")
-    title_pos = ("center", 80) if mode=="landscape" else ("center", 80)
-    title_clip = title_clip.set_position(title_pos).set_start(0).set_duration(3.0)
-
-    text_clips = [title_clip]
+def build_layers(timeline: List[dict], title: str, W: int, H: int, mode: str="landscape") -> List[dict]:
+    """Text overlays as RGBA layers with position and time span; both render engines draw from this list."""
+    title_width = W - 120
+    layers = [{"image": render_text(title, 64 if mode=="shorts" else 54, title_width),
+               "pos": ((W - title_width) // 2, 80), "start": 0.0, "end": 3.0}]
     for i, seg in enumerate(timeline):
         dur = max(2.0, min(8.0, seg["end"]-seg["start"]))
         width_margin = 80 if mode=="shorts" else 140
-        
+
         # 헤드라인 (큰 글씨, 상단)
         headline_fontsize = 48 if mode=="shorts" else 36
         headline_y_pos = int(H*0.25) if mode=="landscape" else int(H*0.30)
-        headline_text = f"{i+1}. {seg['headline']}"
-        headline_clip = TextClip(txt=headline_text, fontsize=headline_fontsize, color="white", 
-                               method="caption", size=(W-width_margin, None), align="West")
-        text_clips.append(headline_clip.set_position((40, headline_y_pos)).set_start(seg["start"]).set_duration(dur))
-        
+        layers.append({"image": render_text(f"{i+1}. {seg['headline']}", headline_fontsize, W-width_margin),
+                       "pos": (40, headline_y_pos), "start": seg["start"], "end": seg["start"] + dur})
+
         # 요약 내용 (작은 글씨, 하단)
         if "summary" in seg and seg["summary"]:
             summary_fontsize = 32 if mode=="shorts" else 24
             summary_y_pos = int(H*0.45) if mode=="landscape" else int(H*0.50)
-            summary_text = seg["summary"]
-            summary_clip = TextClip(txt=summary_text, fontsize=summary_fontsize, color="lightblue", 
-                                  method="caption", size=(W-width_margin, None), align="West")
-            text_clips.append(summary_clip.set_position((40, summary_y_pos)).set_start(seg["start"]).set_duration(dur))
+            layers.append({"image": render_text(seg["summary"], summary_fontsize, W-width_margin, color="lightblue"),
+                           "pos": (40, summary_y_pos), "start": seg["start"], "end": seg["start"] + dur})
+    return layers
+
+def _render_stills(audio_file: str, timeline: List[dict], background_image: str, title: str, output: dict, pool) -> str:
+    W, H = parse_resolution(output["resolution"])
+    profile = encoder_profile(output.get("profile"))
+    bg = background_frame(background_image, W, H)
+    layers = build_layers(timeline, title, W, H, output.get("mode", "landscape"))
+    states = still_states([(l["start"], l["end"], i) for i, l in enumerate(layers)], timeline[-1]["end"] + 1.0, fps=profile["fps"])
+    stills = render_states(states, lambda s: composite(bg, [layers[i] for i in s[2]]))
+    start = time.perf_counter()
+    if pool is None:
+        encode_stills(stills, output["path"], audio=audio_file, profile=profile)
+    else:
+        encode_chunked(stills, output["path"], audio=audio_file, profile=profile, pool=pool)
+    report_encode(output["path"], profile, time.perf_counter() - start, f"정지 화면 {len(set(k for _, _, k in states))}장, ")
+    return output["path"]
+
+def _render_moviepy(audio_file: str, timeline: List[dict], background_image: str, title: str, output: dict) -> str:
+    W, H = parse_resolution(output["resolution"])
+    profile = encoder_profile(output.get("profile"))
+    duration = timeline[-1]["end"] + 1.0
+    bg = background_frame(background_image, W, H)
+    layers = build_layers(timeline, title, W, H, output.get("mode", "landscape"))
+    clips = [ImageClip(bg).set_duration(duration)]
+    for l in layers:
+        clips.append(ImageClip(l["image"]).set_position(l["pos"]).set_start(l["start"]).set_duration(l["end"] - l["start"]))
+    # Video only; the shared narration is attached by stream copy
+    silent = str(Path(output["path"]).with_suffix(".video.mp4"))
+    start = time.perf_counter()
+    CompositeVideoClip(clips, size=(W, H)).write_videofile(
+        silent, fps=profile["fps"], codec="libx264", audio=False, preset=profile["preset"],
+        ffmpeg_params=x264_args(profile, [t for l in layers for t in (l["start"], l["end"])]))
+    mux_audio(silent, audio_file, output["path"], duration)
+    Path(silent).unlink()
+    report_encode(output["path"], profile, time.perf_counter() - start)
+    return output["path"]
+
+def render_outputs(audio_path: Union[str, Tuple[np.ndarray, int]], timeline: List[dict], background_image: str, title: str,
+                   outputs: List[dict], engine: str=None) -> List[str]:
+    """Render one timeline to several outputs, each {"path", "resolution", "mode", optional "profile"}.
+    The narration is encoded once (or taken as is when already encoded, see video_engine.encode_audio)
+    and stream-copied into every file, the background image is decoded once, and with the stills
+    engine the outputs encode in parallel, each split into chunks across worker processes
+    (video_engine.encode_chunked). Profiles are named in config.ENCODER_PROFILES.
+    The chunk workers are spawned processes that re-import the calling script's __main__, so a script
+    calling this must guard its entry point with `if __name__ == "__main__":`, otherwise the workers
+    re-run it and the encode fails with BrokenProcessPool (or set ENCODER_CHUNK_WORKERS=1)."""
+    engine = engine or VIDEO_ENGINE
+    if background_image and Path(background_image).exists():
+        _background_source(str(background_image))  # decode before the workers race for it
+    with tempfile.TemporaryDirectory() as tmp:
+        audio_file = audio_path if is_encoded(audio_path) else \
+            encode_audio(audio_path, str(Path(tmp) / f"narration{AUDIO_CODECS[NARRATION_CODEC][1]}"), NARRATION_CODEC)
+        if engine != "stills":
+            return [_render_moviepy(audio_file, timeline, background_image, title, o) for o in outputs]
+        # Chunks of every output share one process pool; ENCODER_CHUNK_WORKERS=1 encodes each output in one go
+        chunks = chunk_pool() if chunk_workers() > 1 else None
+        try:
+            with ThreadPoolExecutor(max_workers=len(outputs)) as pool:
+                return list(pool.map(lambda o: _render_stills(audio_file, timeline, background_image, title, o, chunks), outputs))
+        finally:
+            if chunks:
+                chunks.shutdown()
 
-    audio = AudioFileClip(audio_path)
-    comp = CompositeVideoClip([bg, *text_clips]).set_audio(audio)
-    comp.write_videofile(out_path, fps=30, codec="libx264", audio_codec="aac", preset="medium")
+def make_video(audio_path: str, timeline: List[dict], background_image: str, resolution: str, title: str, out_path: str,
+               mode: str="landscape", engine: str=None, profile: str=None):
+    """Render the briefing. The "stills" engine composites the layers once per distinct visual state and
+    lets ffmpeg hold each frame; "moviepy" composites every frame. Both give the same picture.
+    Like render_outputs, the stills engine encodes in spawned worker processes: call it from under
+    `if __name__ == "__main__":`."""
+    render_outputs(audio_path, timeline, background_image, title,
+                   [{"path": out_path, "resolution": resolution, "mode": mode, "profile": profile}], engine)